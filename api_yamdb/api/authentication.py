@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import get_cache, get_timeout
+
+USER_KEY = 'auth-user:{}'
+# What authentication, permissions and ``users/me`` read; the password
+# hash and login history stay out of the shared cache.
+USER_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'bio', 'role',
+    'is_active', 'is_staff', 'is_superuser',
+)
+
+
+def dump_user(user):
+    return {field: getattr(user, field) for field in USER_FIELDS}
+
+
+def load_user(data):
+    """A user with only the cached fields loaded; saving it writes just
+    those fields, the others are deferred."""
+    model = get_user_model()
+    fields = [
+        field.attname for field in model._meta.concrete_fields
+        if field.attname in data
+    ]
+    return model.from_db(
+        DEFAULT_DB_ALIAS, fields, [data[field] for field in fields]
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that keeps the fields of the token's user needed
+    by the API in the cache.
+
+    The entry is dropped whenever the user is saved or deleted, see
+    ``api.signals``; updates that send no signal, or reach only another
+    worker's per-process cache, show after the timeout. Writes load the
+    user from the table again.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification'
+            )
+        key = USER_KEY.format(user_id)
+        data = get_cache().get(key)
+        if data is not None:
+            return load_user(data)
+        user = super().get_user(validated_token)
+        get_cache().set(
+            key, dump_user(user), get_timeout(settings.AUTH_USER_CACHE_TIMEOUT)
+        )
+        return user
+
+
+def forget_user(user_id):
+    get_cache().delete(USER_KEY.format(user_id))
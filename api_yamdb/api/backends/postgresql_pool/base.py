@@ -0,0 +1,79 @@
+"""PostgreSQL backend that takes its connections from an in-process pool.
+
+Set ``ENGINE`` to ``api.backends.postgresql_pool`` and size the pool with
+the ``POOL`` dictionary of the database settings. Closing a connection,
+at the end of every request when ``CONN_MAX_AGE`` is 0, returns it to the
+pool instead of disconnecting. When every connection is taken, a request
+waits up to ``POOL['TIMEOUT']`` seconds for one.
+"""
+import threading
+
+import psycopg2.extras
+from django.db.backends.postgresql import base
+from psycopg2 import pool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class BlockingConnectionPool(pool.ThreadedConnectionPool):
+    """``ThreadedConnectionPool`` raises PoolError as soon as it is
+    exhausted; this one waits for a connection to be put back."""
+
+    def __init__(self, minconn, maxconn, timeout, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise pool.PoolError(
+                f'No free connection in the pool after {self.timeout}s'
+            )
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_pool(self, conn_params):
+        with _pools_lock:
+            if self.alias not in _pools:
+                options = self.settings_dict.get('POOL') or {}
+                _pools[self.alias] = BlockingConnectionPool(
+                    options.get('MIN_SIZE', 1),
+                    options.get('MAX_SIZE', 10),
+                    options.get('TIMEOUT', 30),
+                    **conn_params,
+                )
+            return _pools[self.alias]
+
+    def get_new_connection(self, conn_params):
+        # Same session setup as the stock backend, which connects directly.
+        connection = self.get_pool(conn_params).getconn()
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get(
+            'isolation_level', connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                # The pool rolls back unfinished transactions and discards
+                # connections that were closed by the server.
+                _pools[self.alias].putconn(self.connection)
@@ -0,0 +1,288 @@
+import sqlite3
+from collections import Counter
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import SlugRelatedField
+from rest_framework.serializers import as_serializer_error
+
+from reviews.facets import apply_counts, get_cells
+from reviews.summaries import refresh_summaries
+from reviews.models import Category, Genre, Title
+
+from .cache import invalidate
+from .serializers import TitleBulkSerializer
+
+BATCH_SIZE = 1000
+TITLE_FIELDS = ('name', 'year', 'description', 'category_id')
+NOT_FOUND = 'Произведение с id={} не найдено.'
+DUPLICATE = 'Произведение с id={} уже изменяется в этом запросе.'
+
+
+def chunks(values, size=BATCH_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def does_not_exist(value):
+    return SlugRelatedField.default_error_messages['does_not_exist'].format(
+        slug_name='slug', value=value
+    )
+
+
+def run_validation(items):
+    """Run the serializer on every item; returns cleaned items and errors,
+    both keyed by item index."""
+    # Field construction dominates DRF validation, so both serializers are
+    # built once and reused for every item, like ListSerializer does.
+    serializers = {
+        False: TitleBulkSerializer(),
+        True: TitleBulkSerializer(partial=True),
+    }
+    cleaned, errors = {}, {}
+    for index, item in enumerate(items):
+        serializer = serializers[isinstance(item, dict) and 'id' in item]
+        try:
+            cleaned[index] = serializer.run_validation(item)
+        except ValidationError as error:
+            errors[index] = as_serializer_error(error)
+    return cleaned, errors
+
+
+def get_lookups(items):
+    """Genre and category ids by slug and the existing title ids."""
+    genres = dict(Genre.objects.filter(slug__in={
+        slug for item in items for slug in item.get('genre', ())
+    }).values_list('slug', 'id'))
+    categories = dict(Category.objects.filter(slug__in={
+        item['category'] for item in items if 'category' in item
+    }).values_list('slug', 'id'))
+    existing = set()
+    for ids in chunks([item['id'] for item in items if 'id' in item]):
+        existing.update(
+            Title.objects.filter(id__in=ids).values_list('id', flat=True)
+        )
+    return genres, categories, existing
+
+
+def check_item(item, genres, categories, existing, seen):
+    errors = {}
+    if 'id' in item:
+        if item['id'] not in existing:
+            errors['id'] = [NOT_FOUND.format(item['id'])]
+        elif item['id'] in seen:
+            errors['id'] = [DUPLICATE.format(item['id'])]
+        seen.add(item['id'])
+    missing = [slug for slug in item.get('genre', ()) if slug not in genres]
+    if missing:
+        errors['genre'] = [does_not_exist(slug) for slug in missing]
+    if 'category' in item and item['category'] not in categories:
+        errors['category'] = [does_not_exist(item['category'])]
+    return errors
+
+
+def resolve_slugs(item, genres, categories):
+    if 'genre' in item:
+        item['genre'] = list(dict.fromkeys(
+            genres[slug] for slug in item['genre']
+        ))
+    if 'category' in item:
+        item['category_id'] = categories[item.pop('category')]
+
+
+def validate_items(items):
+    """Validate every item, resolving all slugs with one query per model.
+
+    Returns the cleaned items and the errors, both keyed by item index.
+    """
+    cleaned, errors = run_validation(items)
+    genres, categories, existing = get_lookups(list(cleaned.values()))
+    seen = set()
+    for index, item in list(cleaned.items()):
+        item_errors = check_item(item, genres, categories, existing, seen)
+        if item_errors:
+            errors[index] = item_errors
+            del cleaned[index]
+        else:
+            resolve_slugs(item, genres, categories)
+    return cleaned, errors
+
+
+def get_titles(title_ids):
+    """Current category, year and genres of the titles being updated."""
+    titles = {}
+    for ids in chunks(title_ids):
+        for title_id, category_id, year in Title.objects.filter(
+            id__in=ids
+        ).values_list('id', 'category_id', 'year'):
+            titles[title_id] = {
+                'category_id': category_id, 'year': year, 'genre': []
+            }
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=ids
+        ).values_list('title_id', 'genre_id'):
+            titles[title_id]['genre'].append(genre_id)
+    return titles
+
+
+def insert_rows(titles):
+    """INSERT the titles and read their ids back.
+
+    Django 3.2 returns ids from bulk inserts on PostgreSQL only. SQLite
+    3.35+ has RETURNING, which Django 4.0 uses for the same purpose; other
+    backends insert one row at a time and ask for its id.
+    """
+    quote = connection.ops.quote_name
+    fields = [
+        field for field in Title._meta.concrete_fields
+        if not field.primary_key
+    ]
+    table = quote(Title._meta.db_table)
+    pk = quote(Title._meta.pk.column)
+    columns = ', '.join(quote(field.column) for field in fields)
+    placeholder = '({})'.format(', '.join(['%s'] * len(fields)))
+    rows = [
+        [
+            field.get_db_prep_save(field.pre_save(title, True), connection)
+            for field in fields
+        ]
+        for title in titles
+    ]
+    ids = []
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite' and sqlite3.sqlite_version_info >= (
+            3, 35
+        ):
+            for batch in chunks(
+                rows, connection.ops.bulk_batch_size(fields, titles)
+            ):
+                cursor.execute(
+                    f'INSERT INTO {table} ({columns}) VALUES '
+                    f'{", ".join([placeholder] * len(batch))} '
+                    f'RETURNING {pk}',
+                    [value for row in batch for value in row],
+                )
+                # RETURNING has no defined order, the ids of one statement
+                # grow in the order of its rows.
+                ids.extend(sorted(row_id for row_id, in cursor.fetchall()))
+            return ids
+        for row in rows:
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) VALUES {placeholder}', row
+            )
+            ids.append(connection.ops.last_insert_id(
+                cursor, Title._meta.db_table, Title._meta.pk.column
+            ))
+    return ids
+
+
+def insert_titles(items):
+    """Create the titles and return their ids, in the order of ``items``."""
+    titles = [
+        Title(**{field: item[field] for field in TITLE_FIELDS
+                 if field in item})
+        for item in items
+    ]
+    if connection.features.can_return_rows_from_bulk_insert:
+        Title.objects.bulk_create(titles, batch_size=BATCH_SIZE)
+        return [title.pk for title in titles]
+    return insert_rows(titles)
+
+
+def update_titles(items):
+    """Update the titles with one executemany per set of changed fields.
+
+    ``bulk_update`` builds a CASE expression per row, which is too slow
+    for tens of thousands of titles.
+    """
+    table = connection.ops.quote_name(Title._meta.db_table)
+    pk = connection.ops.quote_name(Title._meta.pk.column)
+    now = timezone.now()
+    groups = {}
+    for item in items:
+        fields = tuple(field for field in TITLE_FIELDS if field in item)
+        groups.setdefault(fields, []).append(item)
+    with connection.cursor() as cursor:
+        for fields, group in groups.items():
+            columns = [
+                Title._meta.get_field(field) for field in (*fields, 'updated')
+            ]
+            assignments = ', '.join(
+                f'{connection.ops.quote_name(column.column)} = %s'
+                for column in columns
+            )
+            cursor.executemany(
+                f'UPDATE {table} SET {assignments} WHERE {pk} = %s',
+                [
+                    [
+                        column.get_db_prep_save(
+                            now if column.name == 'updated'
+                            else item[column.attname],
+                            connection,
+                        )
+                        for column in columns
+                    ] + [item['id']]
+                    for item in group
+                ],
+            )
+
+
+def save_titles(items):
+    """Create items without an id and update the others in a few queries.
+
+    Returns the ids of the saved titles and the errors, keyed by index.
+    """
+    cleaned, errors = validate_items(items)
+    created = {
+        index: item for index, item in cleaned.items() if 'id' not in item
+    }
+    updated = {
+        index: item for index, item in cleaned.items() if 'id' in item
+    }
+    ids = {index: item['id'] for index, item in updated.items()}
+    cells = Counter()
+    links = []
+    with transaction.atomic():
+        ids.update(zip(created, insert_titles(list(created.values()))))
+        for index, item in created.items():
+            links.extend((ids[index], genre_id) for genre_id in item['genre'])
+            cells.update(get_cells(
+                item['category_id'], item['year'], item['genre']
+            ))
+        if updated:
+            old_titles = get_titles(list(ids.values()))
+            for item in updated.values():
+                old = old_titles[item['id']]
+                new = {**old, **item}
+                cells.subtract(get_cells(
+                    old['category_id'], old['year'], old['genre']
+                ))
+                cells.update(get_cells(
+                    new['category_id'], new['year'], new['genre']
+                ))
+                if 'genre' in item:
+                    links.extend(
+                        (item['id'], genre_id) for genre_id in item['genre']
+                    )
+            update_titles(updated.values())
+            for title_ids in chunks([
+                item['id'] for item in updated.values() if 'genre' in item
+            ]):
+                Title.genre.through.objects.filter(
+                    title_id__in=title_ids
+                ).delete()
+        Title.genre.through.objects.bulk_create(
+            (
+                Title.genre.through(title_id=title_id, genre_id=genre_id)
+                for title_id, genre_id in links
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        # bulk_create and raw updates send no signals, keep the facet
+        # counts, the summaries and the cached responses in sync here.
+        apply_counts(cells)
+        refresh_summaries(ids.values())
+        if cleaned:
+            invalidate('titles')
+    return ids, errors
@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+GENERATION_KEY = 'api-cache:generation:{}'
+RESPONSE_KEY = 'api-cache:response:{}:{}:{}'
+WRITTEN_KEY = 'api-cache:written:{}'
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def is_shared():
+    """Whether all worker processes see the same cache, and so the same
+    generations."""
+    return not isinstance(get_cache(), LocMemCache)
+
+
+def get_timeout(timeout):
+    """A per-process cache only learns about writes handled by its own
+    worker, so its entries expire after ``API_CACHE_LOCAL_TIMEOUT``."""
+    if is_shared():
+        return timeout
+    return min(timeout, settings.API_CACHE_LOCAL_TIMEOUT)
+
+
+def new_generation():
+    return int(time.time() * 1000)
+
+
+def get_generation(namespace):
+    cache = get_cache()
+    key = GENERATION_KEY.format(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, new_generation(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(*namespaces):
+    cache = get_cache()
+    for namespace in namespaces:
+        key = GENERATION_KEY.format(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, new_generation(), timeout=None)
+    if settings.DATABASE_REPLICAS:
+        cache.set_many(
+            {WRITTEN_KEY.format(namespace): 1 for namespace in namespaces},
+            settings.DATABASE_REPLICA_STICKY,
+        )
+
+
+def was_written(namespace):
+    """Whether the namespace changed recently enough for the replicas to
+    lag behind, within the ``DATABASE_REPLICA_STICKY`` window."""
+    return (bool(settings.DATABASE_REPLICAS)
+            and get_cache().get(WRITTEN_KEY.format(namespace)) is not None)
+
+
+def invalidate(*namespaces):
+    """Drop cached responses of the namespaces once the write is committed."""
+    transaction.on_commit(lambda: bump_generation(*namespaces))
+
+
+def normalize_query(query_params):
+    params = sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+        # An empty value still matters, e.g. ``?cursor=`` switches the
+        # pagination mode.
+        if not (key == 'page' and value == '1')
+    )
+    return '&'.join(f'{key}={value}' for key, value in params)
+
+
+def build_key(namespace, request):
+    url = (f'{request.get_host()}{request.path}?'
+           f'{normalize_query(request.GET)}')
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return RESPONSE_KEY.format(namespace, get_generation(namespace), digest)
+
+
+def record(namespace, hit):
+    with _stats_lock:
+        _stats[(namespace, 'hits' if hit else 'misses')] += 1
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    result = {}
+    for (namespace, kind), value in stats.items():
+        result.setdefault(namespace, {'hits': 0, 'misses': 0})[kind] = value
+    return result
@@ -0,0 +1,17 @@
+from django.core.checks import Tags, Warning, register
+
+from .cache import is_shared
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if is_shared():
+        return []
+    return [Warning(
+        'The API cache is local to each process.',
+        hint=('Writes only invalidate cached responses, cached users and '
+              'throttle buckets in the worker that handled them. Set '
+              'CACHE_BACKEND to Redis or Memcached when running several '
+              'workers.'),
+        id='api.W001',
+    )]
@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def set_sqlite_pragmas(sender, connection, **kwargs):
+    """Tune every new SQLite connection, the pragmas are per connection."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+@receiver(connection_created)
+def mark_connection_checked(sender, connection, **kwargs):
+    connection.health_checked_at = time.monotonic()
+
+
+@receiver(request_started)
+def check_persistent_connections(**kwargs):
+    """Drop persistent connections the server closed since the last check.
+
+    Django reuses a connection for ``CONN_MAX_AGE`` seconds without ever
+    checking it, so a restarted database would fail the next request. A
+    check is a round trip, so it runs at most every
+    ``HEALTH_CHECK_INTERVAL`` seconds; a connection that failed a query is
+    already checked by Django when its request finishes.
+    """
+    now = time.monotonic()
+    for connection in connections.all():
+        options = connection.settings_dict
+        if connection.connection is None or not options.get('HEALTH_CHECKS'):
+            continue
+        checked_at = getattr(connection, 'health_checked_at', None)
+        if (checked_at is not None
+                and now - checked_at < options['HEALTH_CHECK_INTERVAL']):
+            continue
+        connection.health_checked_at = now
+        if not connection.is_usable():
+            connection.close()
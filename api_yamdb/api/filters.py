@@ -1,6 +1,7 @@
 import django_filters
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -9,7 +10,11 @@ class TitleFilter(django_filters.FilterSet):
     genre = django_filters.CharFilter(field_name='genre__slug')
     category = django_filters.CharFilter(field_name='category__slug')
     year = django_filters.NumberFilter(field_name='year')
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ['genre', 'category', 'year']
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
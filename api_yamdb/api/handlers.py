@@ -0,0 +1,34 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler as BaseASGIHandler
+
+
+class ASGIHandler(BaseASGIHandler):
+    """Reads streaming responses in the sync thread, chunk by chunk.
+
+    Django 3.2 iterates them on the event loop, where the ORM cannot run,
+    so the parts are pulled here and the response is handed on empty.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+        parts = iter(response)
+        response.streaming_content = ()
+        next_part = sync_to_async(next)
+
+        async def send_parts(message):
+            # The closing message comes before ``response.close()``, which
+            # releases the database connections.
+            if message == {'type': 'http.response.body'}:
+                part = await next_part(parts, None)
+                while part is not None:
+                    for chunk, _ in self.chunk_bytes(part):
+                        await send({
+                            'type': 'http.response.body',
+                            'body': chunk,
+                            'more_body': True,
+                        })
+                    part = await next_part(parts, None)
+            await send(message)
+
+        await super().send_response(response, send_parts)
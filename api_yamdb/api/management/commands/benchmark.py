@@ -0,0 +1,348 @@
+import io
+import json
+import os
+import statistics
+import subprocess
+import time
+from itertools import count
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import caches
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test.utils import (CaptureQueriesContext,
+                               setup_test_environment,
+                               teardown_test_environment)
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.throttling import TokenBucketThrottle
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+GENRES = 10
+CATEGORIES = 3
+
+
+def seed_dataset(titles=100, reviews=5, comments=2, genres=3):
+    """Fill the database with a synthetic catalogue.
+
+    Every title gets ``genres`` genres, ``reviews`` reviews from distinct
+    users and every review gets ``comments`` comments.
+    """
+    Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(CATEGORIES)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(max(GENRES, genres))
+    )
+    User.objects.bulk_create(
+        User(username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake')
+        for idx in range(max(reviews, 1))
+    )
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    user_ids = list(User.objects.values_list('id', flat=True))
+    Title.objects.bulk_create(
+        (
+            Title(
+                name=f'Произведение {idx}',
+                year=1950 + idx % 70,
+                category_id=category_ids[idx % len(category_ids)],
+                description=f'Описание произведения {idx}',
+            )
+            for idx in range(titles)
+        ),
+        batch_size=1000,
+    )
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    Title.genre.through.objects.bulk_create(
+        (
+            Title.genre.through(
+                title_id=title_id,
+                genre_id=genre_ids[(idx + shift) % len(genre_ids)],
+            )
+            for idx, title_id in enumerate(title_ids)
+            for shift in range(genres)
+        ),
+        batch_size=1000,
+    )
+    Review.objects.bulk_create(
+        (
+            Review(
+                title_id=title_id,
+                author_id=user_ids[shift],
+                text=f'Отзыв {shift} на произведение {title_id}',
+                score=(title_id + shift) % 10 + 1,
+            )
+            for title_id in title_ids
+            for shift in range(reviews)
+        ),
+        batch_size=1000,
+    )
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                review_id=review_id,
+                author_id=author_id,
+                text=f'Комментарий {shift} к отзыву {review_id}',
+            )
+            for review_id, author_id in Review.objects.values_list(
+                'id', 'author_id'
+            ).iterator()
+            for shift in range(comments)
+        ),
+        batch_size=1000,
+    )
+    call_command('rebuild_ratings', stdout=io.StringIO())
+    call_command('rebuild_facets', stdout=io.StringIO())
+    call_command('rebuild_summaries', stdout=io.StringIO())
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    index = min(int(round(fraction * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = ('Seeds a throwaway test database and measures the latency and '
+            'query count of the main API routes')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=100)
+        parser.add_argument('--reviews', type=int, default=5,
+                            help='Reviews per title')
+        parser.add_argument('--comments', type=int, default=2,
+                            help='Comments per review')
+        parser.add_argument('--genres', type=int, default=3,
+                            help='Genres per title')
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--scenario', action='append',
+                            help='Run only the given scenario(s)')
+        parser.add_argument('--warm-cache', action='store_true',
+                            help='Keep the response cache between requests')
+        parser.add_argument('--conn-max-age', type=int,
+                            help='Override CONN_MAX_AGE of the database')
+        parser.add_argument('--connection-lifecycle', action='store_true',
+                            help='Close obsolete connections around every '
+                                 'request like the WSGI handler does')
+        parser.add_argument('--output', help='Save results as JSON')
+        parser.add_argument('--compare', help='Baseline JSON to compare to')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Allowed p95 slowdown against the baseline')
+
+    def handle(self, *args, **options):
+        self.options = options
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        if options['conn_max_age'] is not None:
+            connection.settings_dict['CONN_MAX_AGE'] = options['conn_max_age']
+        if (options['connection_lifecycle']
+                and connection.vendor == 'sqlite'
+                and not connection.settings_dict['TEST']['NAME']):
+            # In-memory SQLite databases are never closed, use a file.
+            connection.settings_dict['TEST']['NAME'] = os.path.join(
+                settings.BASE_DIR, 'benchmark.sqlite3'
+            )
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seed_dataset(options['titles'], options['reviews'],
+                         options['comments'], options['genres'])
+            results = self.run_scenarios()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.print_results(results)
+        report = {
+            'commit': self.get_commit(),
+            'dataset': {key: options[key] for key in
+                        ('titles', 'reviews', 'comments', 'genres')},
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'connection_lifecycle': options['connection_lifecycle'],
+            'iterations': options['iterations'],
+            'scenarios': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, indent=2)
+        if options['compare']:
+            self.compare(results, options['compare'])
+
+    def get_scenarios(self):
+        title = Title.objects.order_by('id').first()
+        review = title.reviews.order_by('id').first()
+        genre = title.genre.first()
+        anonymous = APIClient()
+        numbers = count()
+        code_user = User.objects.create(
+            username='bench_token', email='bench_token@yamdb.fake'
+        )
+        code = default_token_generator.make_token(code_user)
+
+        def signup():
+            idx = next(numbers)
+            return anonymous.post('/api/v1/auth/signup/', data={
+                'username': f'bench_signup{idx}',
+                'email': f'bench_signup{idx}@yamdb.fake',
+            })
+
+        def review_create():
+            idx = next(numbers)
+            author = User.objects.create(
+                username=f'bench_author{idx}',
+                email=f'bench_author{idx}@yamdb.fake',
+            )
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(author)}'
+            )
+            return lambda: client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Отзыв для замера', 'score': 7},
+            )
+
+        return {
+            'title_list': lambda: anonymous.get('/api/v1/titles/?page=2'),
+            'title_list_filtered': lambda: anonymous.get(
+                f'/api/v1/titles/?genre={genre.slug}'
+                f'&category={title.category.slug}&year={title.year}'
+            ),
+            'title_facets': lambda: anonymous.get(
+                f'/api/v1/titles/facets/?category={title.category.slug}'
+            ),
+            'title_detail': lambda: anonymous.get(
+                f'/api/v1/titles/{title.id}/'
+            ),
+            'review_list': lambda: anonymous.get(
+                f'/api/v1/titles/{title.id}/reviews/'
+            ),
+            'comment_list': lambda: anonymous.get(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            ),
+            'signup': signup,
+            'token': lambda: anonymous.post('/api/v1/auth/token/', data={
+                'username': code_user.username,
+                'confirmation_code': code,
+            }),
+            # Preparing the author is not timed, only the returned request.
+            'review_create': review_create,
+        }
+
+    def run_scenarios(self):
+        scenarios = self.get_scenarios()
+        selected = self.options['scenario'] or list(scenarios)
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            raise CommandError(f'Unknown scenario(s): {", ".join(unknown)}')
+        results = {}
+        # The throttles still run, but never refuse the benchmark's burst.
+        rates = TokenBucketThrottle.THROTTLE_RATES
+        TokenBucketThrottle.THROTTLE_RATES = {
+            scope: f'{10 ** 9}/s' for scope in rates
+        }
+        try:
+            for name in selected:
+                results[name] = self.run_scenario(name, scenarios[name])
+        finally:
+            TokenBucketThrottle.THROTTLE_RATES = rates
+        return results
+
+    def run_scenario(self, name, scenario):
+        cache = caches['default']
+        latencies, queries, connects = [], [], []
+        runs = self.options['warmup'] + self.options['iterations']
+        lifecycle = self.options['connection_lifecycle']
+        started = time.perf_counter()
+        busy = 0.0
+        opened = []
+
+        def count_connection(**kwargs):
+            opened.append(1)
+
+        connection_created.connect(count_connection)
+        for run in range(runs):
+            if not self.options['warm_cache']:
+                cache.clear()
+            request = scenario
+            if name == 'review_create':
+                request = scenario()
+            # The test client skips the handlers that close connections at
+            # request start and finish, so they are called here.
+            with CaptureQueriesContext(connection) as context:
+                opened.clear()
+                request_started = time.perf_counter()
+                if lifecycle:
+                    close_old_connections()
+                response = request()
+                if lifecycle:
+                    close_old_connections()
+                elapsed = time.perf_counter() - request_started
+            if response.status_code >= 400:
+                raise CommandError(
+                    f'{name}: unexpected status {response.status_code}'
+                )
+            if run >= self.options['warmup']:
+                latencies.append(elapsed * 1000)
+                queries.append(len(context))
+                connects.append(len(opened))
+                busy += elapsed
+        connection_created.disconnect(count_connection)
+        return {
+            'p50_ms': round(percentile(latencies, 0.50), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'mean_ms': round(statistics.mean(latencies), 3),
+            'throughput_rps': round(len(latencies) / busy, 1),
+            'queries': round(statistics.mean(queries), 2),
+            'connects': round(statistics.mean(connects), 2),
+            'wall_s': round(time.perf_counter() - started, 3),
+        }
+
+    def print_results(self, results):
+        self.stdout.write(
+            f'{"scenario":<22}{"p50":>9}{"p95":>9}{"p99":>9}'
+            f'{"rps":>9}{"queries":>9}{"connects":>9}'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<22}{result["p50_ms"]:>9.2f}{result["p95_ms"]:>9.2f}'
+                f'{result["p99_ms"]:>9.2f}{result["throughput_rps"]:>9.1f}'
+                f'{result["queries"]:>9.1f}{result["connects"]:>9.2f}'
+            )
+
+    def compare(self, results, path):
+        with open(path, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['scenarios']
+        regressions = []
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            before = baseline[name]
+            change = result['p95_ms'] / before['p95_ms'] - 1
+            self.stdout.write(
+                f'{name:<22}p95 {before["p95_ms"]:.2f} -> '
+                f'{result["p95_ms"]:.2f} ms ({change:+.0%}), queries '
+                f'{before["queries"]} -> {result["queries"]}'
+            )
+            if (change > self.options['threshold']
+                    or result['queries'] > before['queries']):
+                regressions.append(name)
+        if regressions:
+            raise CommandError(
+                f'Regressions against {path}: {", ".join(regressions)}'
+            )
+
+    def get_commit(self):
+        try:
+            return subprocess.run(
+                ('git', 'rev-parse', '--short', 'HEAD'),
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from django.core.cache import caches
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from reviews.models import Title
+
+from .benchmark import percentile, seed_dataset
+
+MODES = ('wsgi', 'asgi')
+
+
+class Command(BaseCommand):
+    help = ('Compares the throughput of the read API under WSGI threads '
+            'and ASGI')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=100)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--mode', action='append', choices=MODES,
+                            help='Run only the given mode(s)')
+
+    def handle(self, *args, **options):
+        self.options = options
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seed_dataset(options['titles'])
+            urls = self.get_urls()
+            results = {
+                mode: self.run_mode(mode, urls)
+                for mode in options['mode'] or MODES
+            }
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.stdout.write(
+            f'{"mode":<12}{"rps":>9}{"p50":>9}{"p95":>9}{"errors":>8}'
+        )
+        for mode, result in results.items():
+            self.stdout.write(
+                f'{mode:<12}{result["rps"]:>9.1f}{result["p50_ms"]:>9.2f}'
+                f'{result["p95_ms"]:>9.2f}{result["errors"]:>8}'
+            )
+
+    def get_urls(self):
+        """Anonymous read traffic over titles, reviews and comments."""
+        urls = []
+        for title in Title.objects.order_by('id')[:20]:
+            review = title.reviews.order_by('id').first()
+            urls += [
+                f'/api/v1/titles/?page={title.id % 5 + 1}',
+                f'/api/v1/titles/{title.id}/',
+                f'/api/v1/titles/{title.id}/reviews/',
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            ]
+        if not urls:
+            raise CommandError('The dataset has no titles')
+        return list(islice(cycle(urls), self.options['requests']))
+
+    def run_mode(self, mode, urls):
+        caches['default'].clear()
+        started = time.perf_counter()
+        if mode == 'wsgi':
+            latencies, errors = self.run_threads(urls)
+        else:
+            latencies, errors = asyncio.run(self.run_async(urls))
+        elapsed = time.perf_counter() - started
+        return {
+            'rps': len(urls) / elapsed,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'errors': errors,
+        }
+
+    def run_threads(self, urls):
+        def get(url):
+            started = time.perf_counter()
+            response = Client().get(url)
+            return time.perf_counter() - started, response.status_code
+
+        with ThreadPoolExecutor(self.options['concurrency']) as executor:
+            results = list(executor.map(get, urls))
+        return self.collect(results)
+
+    async def run_async(self, urls):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(self.options['concurrency'])
+
+        async def get(url):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url)
+                return time.perf_counter() - started, response.status_code
+
+        results = await asyncio.gather(*(get(url) for url in urls))
+        return self.collect(results)
+
+    def collect(self, results):
+        latencies = [elapsed for elapsed, _ in results]
+        errors = sum(1 for _, code in results if code >= 400)
+        return latencies, errors
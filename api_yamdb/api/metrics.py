@@ -0,0 +1,92 @@
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_endpoints = {}
+_endpoints_lock = threading.Lock()
+
+
+class RequestMetrics:
+    """Per-request timings, also used as a database execute wrapper."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.tag = None
+        self.queries = 0
+        self.db = 0.0
+        self.view_started = None
+        self.view = 0.0
+        self.render = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self, total):
+        return ', '.join((
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"',
+            f'view;dur={max(self.view - self.db, 0) * 1000:.2f}',
+            f'render;dur={self.render * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ))
+
+
+class EndpointStats:
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, total_ms, db_ms, queries):
+        self.count += 1
+        self.total_ms += total_ms
+        self.db_ms += db_ms
+        self.queries += queries
+        self.buckets[bisect_left(BUCKETS_MS, total_ms)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the histogram bucket holding the percentile."""
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 2),
+            'avg_db_ms': round(self.db_ms / self.count, 2),
+            'avg_queries': round(self.queries / self.count, 2),
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'buckets': dict(zip(
+                [str(bound) for bound in BUCKETS_MS] + ['inf'],
+                self.buckets,
+            )),
+        }
+
+
+def record(tag, total, metrics):
+    with _endpoints_lock:
+        stats = _endpoints.get(tag)
+        if stats is None:
+            stats = _endpoints[tag] = EndpointStats()
+        stats.add(total * 1000, metrics.db * 1000, metrics.queries)
+
+
+def get_snapshot():
+    with _endpoints_lock:
+        return {tag: stats.as_dict() for tag, stats in _endpoints.items()}
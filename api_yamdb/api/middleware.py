@@ -0,0 +1,160 @@
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics
+from .routers import (SAFE_METHODS, LatencyTimer, get_client_key, is_sticky,
+                      stick_to_primary, use_replicas)
+
+
+def get_view_tag(view_func, method):
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'unknown')
+    actions = getattr(view_func, 'actions', None) or {}
+    action = actions.get(method.lower(), method.lower())
+    return f'{view_class.__name__}.{action}'
+
+
+def enter_execute_wrappers(stack, wrappers):
+    """Install (alias, wrapper) pairs; an alias of None wraps everything."""
+    for alias, wrapper in wrappers:
+        targets = connections.all() if alias is None else (
+            connections[alias],
+        )
+        for connection in targets:
+            stack.enter_context(connection.execute_wrapper(wrapper))
+
+
+class ExecuteWrapperMiddleware:
+    """Base for middleware that wraps the queries of a request.
+
+    Subclasses implement ``before`` and ``after``; the rows of a streamed
+    response are read in the same context once the chain has returned.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        wrappers = self.before(request)
+        with ExitStack() as stack:
+            enter_execute_wrappers(stack, wrappers)
+            response = self.get_response(request)
+        return self.finish(request, response, wrappers)
+
+    def finish(self, request, response, wrappers):
+        response = self.after(request, response)
+        if response.streaming:
+            response.streaming_content = self.stream(
+                request, response.streaming_content, wrappers
+            )
+        return response
+
+    def before(self, request):
+        """Prepare the request, returns (alias, execute wrapper) pairs."""
+        return ()
+
+    def after(self, request, response):
+        return response
+
+    def stream(self, request, content, wrappers):
+        """Streamed rows are read once ``after`` has run, in the execute
+        wrappers entered again."""
+        with ExitStack() as stack:
+            enter_execute_wrappers(stack, wrappers)
+            yield from content
+
+
+class QueryTimingMiddleware(ExecuteWrapperMiddleware):
+    """Counts SQL queries and times each request phase per view action.
+
+    Timings are returned in the ``Server-Timing`` header and aggregated
+    in ``api.metrics``. The header of a streamed response is sent before
+    its rows are read, so those queries only reach the aggregates.
+    """
+
+    def __init__(self, get_response):
+        if not settings.API_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def before(self, request):
+        request.metrics = metrics.RequestMetrics()
+        return ((None, request.metrics),)
+
+    def after(self, request, response):
+        request_metrics = request.metrics
+        total = perf_counter() - request_metrics.started
+        response['Server-Timing'] = request_metrics.server_timing(total)
+        if not response.streaming:
+            self.record(request_metrics)
+        return response
+
+    def stream(self, request, content, wrappers):
+        yield from super().stream(request, content, wrappers)
+        self.record(request.metrics)
+
+    def record(self, request_metrics):
+        if request_metrics.tag is not None:
+            metrics.record(
+                request_metrics.tag,
+                perf_counter() - request_metrics.started,
+                request_metrics,
+            )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics.tag = get_view_tag(view_func, request.method)
+        request.metrics.view_started = perf_counter()
+
+    def process_template_response(self, request, response):
+        request_metrics = request.metrics
+        started = perf_counter()
+        if request_metrics.view_started is not None:
+            request_metrics.view = started - request_metrics.view_started
+
+        def rendered(response):
+            request_metrics.render = perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class ReplicaRoutingMiddleware(ExecuteWrapperMiddleware):
+    """Route safe requests to a replica unless the client wrote recently.
+
+    After a successful write the client reads from the primary for
+    ``DATABASE_REPLICA_STICKY`` seconds, so it sees its own review or
+    comment before the replicas catch up.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def before(self, request):
+        client_key = get_client_key(request)
+        safe = request.method in SAFE_METHODS
+        request.replicas = use_replicas(
+            safe and not (client_key and is_sticky(client_key))
+        )
+        replica = request.replicas.__enter__()
+        if replica is None:
+            return ()
+        return ((replica, LatencyTimer(replica)),)
+
+    def stream(self, request, content, wrappers):
+        with request.replicas:
+            yield from super().stream(request, content, wrappers)
+
+    def after(self, request, response):
+        request.replicas.__exit__(None, None, None)
+        client_key = get_client_key(request)
+        if (request.method not in SAFE_METHODS and client_key
+                and response.status_code < 400):
+            stick_to_primary(client_key)
+        return response
@@ -0,0 +1,179 @@
+import hashlib
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.http import (http_date, parse_etags,
+                               parse_http_date_safe, quote_etag)
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from . import cache
+from .routers import use_replicas
+
+
+def get_validators(request, count, updated):
+    """ETag and Last-Modified of a response built from ``count`` rows."""
+    etag = quote_etag(hashlib.md5(
+        f'{request.get_full_path()}:{count}:'
+        f'{updated.isoformat() if updated else ""}'.encode()
+    ).hexdigest())
+    validators = {'ETag': etag}
+    if updated is not None:
+        validators['Last-Modified'] = http_date(updated.timestamp())
+    return validators
+
+
+def is_not_modified(request, validators):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        return (if_none_match.strip() == '*'
+                or validators['ETag'] in parse_etags(if_none_match))
+    if_modified_since = parse_http_date_safe(
+        request.META.get('HTTP_IF_MODIFIED_SINCE', '')
+    )
+    last_modified = parse_http_date_safe(
+        validators.get('Last-Modified', '')
+    )
+    return (if_modified_since is not None
+            and last_modified is not None
+            and last_modified <= if_modified_since)
+
+
+def not_modified_response(validators):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers=validators)
+
+
+class CachedResponseMixin:
+    """Serve anonymous list and retrieve requests from the API cache."""
+    cache_namespace = None
+
+    def is_cacheable(self, request):
+        return (
+            self.cache_namespace is not None
+            and request.method == 'GET'
+            and request.user.is_anonymous
+        )
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+        key = cache.build_key(self.cache_namespace, request)
+        cached = cache.get_cache().get(key)
+        cache.record(self.cache_namespace, hit=cached is not None)
+        if cached is not None:
+            data, validators = cached
+            if validators and is_not_modified(request, validators):
+                return not_modified_response(validators)
+            return Response(data, headers=validators)
+        # A lagging replica would put the data from before the last write
+        # back in the cache until it expires.
+        with (use_replicas(enabled=False)
+              if cache.was_written(self.cache_namespace) else nullcontext()):
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            validators = {
+                header: response[header]
+                for header in ('ETag', 'Last-Modified') if header in response
+            }
+            cache.get_cache().set(
+                key, (response.data, validators),
+                cache.get_timeout(settings.API_CACHE_TIMEOUT),
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ListResponseMixin:
+    """``list`` split into steps that other mixins and views override."""
+
+    def list(self, request, *args, **kwargs):
+        return self.get_list_response(
+            self.filter_queryset(self.get_queryset())
+        )
+
+    def get_list_response(self, queryset):
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize_list(page))
+        return Response(self.serialize_list(queryset))
+
+    def serialize_list(self, rows):
+        return self.get_serializer(rows, many=True).data
+
+
+class ConditionalGetMixin(ListResponseMixin):
+    """Answer list requests with an ETag, retrieve requests with ETag and
+    Last-Modified.
+
+    Lists are fingerprinted by the count and latest ``updated_field`` of the
+    filtered queryset, details by the fetched object, so a 304 never runs
+    the serializer. Deleting a row does not move the latest ``updated``,
+    so lists have no Last-Modified and only answer ``If-None-Match``.
+
+    Pages that are not counted, cursor pages and ``count=false`` pages,
+    get an ETag of their content instead: the fingerprint would bring the
+    COUNT(*) back.
+    """
+    updated_field = 'updated'
+
+    def fingerprints_list(self):
+        get_cursor_paginator = getattr(
+            self.paginator, 'get_cursor_paginator', None
+        )
+        if (get_cursor_paginator
+                and get_cursor_paginator(self.request) is not None):
+            return False
+        skips_count = getattr(self.paginator, 'skips_count', None)
+        return not (skips_count and skips_count(self.request))
+
+    def validate_content(self, response):
+        if response.status_code != 200 or response.streaming:
+            return response
+        validators = {'ETag': quote_etag(hashlib.md5(
+            JSONRenderer().render(response.data)
+        ).hexdigest())}
+        if is_not_modified(self.request, validators):
+            return not_modified_response(validators)
+        response['ETag'] = validators['ETag']
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not self.fingerprints_list():
+            return self.validate_content(self.get_list_response(queryset))
+        fingerprint = queryset.order_by().aggregate(
+            count=Count('pk'), updated=Max(self.updated_field)
+        )
+        validators = get_validators(
+            request, fingerprint['count'], fingerprint['updated']
+        )
+        validators.pop('Last-Modified', None)
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        # Saves the paginator its own COUNT(*).
+        self.list_count = fingerprint['count']
+        response = self.get_list_response(queryset)
+        for header, value in validators.items():
+            response[header] = value
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        validators = get_validators(
+            request, 1, getattr(instance, self.updated_field)
+        )
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers=validators)
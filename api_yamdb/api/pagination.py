@@ -0,0 +1,253 @@
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (Cursor, CursorPagination,
+                                       PageNumberPagination, _reverse_ordering)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PageSizePagination(PageNumberPagination):
+    """Page number pagination where clients choose ``page_size`` up to
+    ``max_page_size`` and may pass ``count=false`` to skip the total.
+
+    Views that have already counted the rows, e.g. for their ETag, leave
+    the number in ``list_count`` and no ``COUNT(*)`` is run.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+
+    def skips_count(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('false', '0')
+
+    def get_page(self, queryset, request, view=None):
+        """The Django page; its ``object_list`` is not evaluated yet."""
+        paginator = self.django_paginator_class(
+            queryset, self.get_page_size(request)
+        )
+        count = getattr(view, 'list_count', None)
+        if count is not None:
+            paginator.count = count
+        page_number = self.get_page_number(request, paginator)
+        try:
+            return paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        self.counted = not self.skips_count(request)
+        if not self.counted:
+            return self.paginate_without_count(queryset, page_size)
+        self.page = self.get_page(queryset, request, view)
+        if self.page.paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+    def paginate_without_count(self, queryset, page_size):
+        """Fetch one extra row to learn whether there is a next page."""
+        page_number = self.request.query_params.get(
+            self.page_query_param, '1'
+        )
+        try:
+            self.page_number = int(page_number)
+            if self.page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message='Неверный номер страницы'
+            ))
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message='Страница пуста'
+            ))
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.counted:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param,
+            self.page_number + 1,
+        )
+
+    def get_previous_link(self):
+        if self.counted:
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.page_number - 1
+        )
+
+    def get_paginated_response(self, data):
+        if self.counted:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination over the whole ``ordering``, which must end with
+    a unique field.
+
+    DRF filters on the first ordering field only and skips the rows that
+    share its value with an offset. Here the cursor holds every field of
+    the ordering and the page starts right after it, so rows with equal
+    timestamps cost nothing extra and are never skipped or repeated.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor else None
+        ordering = (
+            _reverse_ordering(self.ordering) if reverse else self.ordering
+        )
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_following(ordering, position)
+                )
+            except (DjangoValidationError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+        rows = list(queryset[:self.page_size + 1])
+        self.page = rows[:self.page_size]
+        has_more = len(rows) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_following(self, ordering, position):
+        """Rows after ``position`` in ``ordering``, a row comparison."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = '__lt' if field.startswith('-') else '__gt'
+            condition |= Q(**equal, **{name + lookup: value})
+            equal[name] = value
+        return condition
+
+    def get_position(self, instance):
+        return [
+            str(getattr(instance, field.lstrip('-')))
+            for field in self.ordering
+        ]
+
+    def get_link(self, reverse, instance):
+        # Past either end of the data the link restarts from that end.
+        position = None if instance is None else self.get_position(instance)
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=reverse, position=position)
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.get_link(False, self.page[-1] if self.page else None)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.get_link(True, self.page[0] if self.page else None)
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if (not isinstance(position, list)
+                or len(position) != len(self.ordering)
+                or not all(isinstance(value, str) for value in position)):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor._replace(position=position)
+
+    def encode_cursor(self, cursor):
+        if cursor.position is not None:
+            cursor = cursor._replace(position=json.dumps(cursor.position))
+        return super().encode_cursor(cursor)
+
+
+class CursorOptInPagination(PageSizePagination):
+    """Page number pagination that switches to keyset pagination when the
+    client passes the ``cursor`` query parameter (empty for the first page).
+    """
+    cursor_ordering = None
+
+    def get_cursor_paginator(self, request):
+        paginator = KeysetCursorPagination()
+        paginator.ordering = self.cursor_ordering
+        paginator.page_size = self.get_page_size(request)
+        if paginator.cursor_query_param in request.query_params:
+            return paginator
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = self.get_cursor_paginator(request)
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(PageSizePagination):
+    max_page_size = 100
+
+
+class UserPagination(PageSizePagination):
+    # Admins page through users in bulk, large pages are streamed.
+    max_page_size = 1000
+
+
+class ReviewPagination(CursorOptInPagination):
+    cursor_ordering = ('-pub_date', '-id')
+    max_page_size = 50
+
+
+class CommentPagination(CursorOptInPagination):
+    cursor_ordering = ('pub_date', 'id')
+    max_page_size = 50
@@ -0,0 +1,108 @@
+import hashlib
+import threading
+from itertools import count
+from time import perf_counter
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import connections
+
+from .cache import get_cache
+
+STICKY_KEY = 'db-sticky:{}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_state = Local()
+_counter = count()
+_latency = {}
+_latency_lock = threading.Lock()
+
+
+def get_client_key(request):
+    """Identify the client by its token before DRF authenticates it."""
+    header = request.META.get('HTTP_AUTHORIZATION')
+    if not header:
+        return None
+    return hashlib.md5(header.encode()).hexdigest()
+
+
+def is_sticky(client_key):
+    return get_cache().get(STICKY_KEY.format(client_key)) is not None
+
+
+def stick_to_primary(client_key):
+    get_cache().set(
+        STICKY_KEY.format(client_key), 1, settings.DATABASE_REPLICA_STICKY
+    )
+
+
+def record_latency(alias, seconds):
+    """Exponentially weighted query latency of a replica."""
+    with _latency_lock:
+        previous = _latency.get(alias)
+        _latency[alias] = seconds if previous is None else (
+            0.8 * previous + 0.2 * seconds
+        )
+
+
+def choose_replica(replicas):
+    if settings.DATABASE_REPLICA_SELECTION == 'least-latency':
+        with _latency_lock:
+            # Replicas without measurements are tried first.
+            return min(replicas, key=lambda alias: _latency.get(alias, 0))
+    return replicas[next(_counter) % len(replicas)]
+
+
+class LatencyTimer:
+    def __init__(self, alias):
+        self.alias = alias
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            record_latency(self.alias, perf_counter() - started)
+
+
+class use_replicas:
+    """Let the router send reads of the current request to a replica.
+
+    Entered again, e.g. to read a streamed body, it keeps the replica it
+    chose first.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.replica = None
+
+    def __enter__(self):
+        self.previous = getattr(_state, 'replica', None)
+        if (self.replica is None and self.enabled
+                and settings.DATABASE_REPLICAS):
+            self.replica = choose_replica(settings.DATABASE_REPLICAS)
+        _state.replica = self.replica
+        return self.replica
+
+    def __exit__(self, *exc_info):
+        _state.replica = self.previous
+
+
+class ReplicaRouter:
+    """Reads go to the replica chosen for the request, writes to default.
+
+    Outside of ``ReplicaRoutingMiddleware`` (management commands, tests)
+    everything uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = getattr(_state, 'replica', None)
+        if replica is not None and not connections['default'].in_atomic_block:
+            return replica
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -1,5 +1,4 @@
 from rest_framework import serializers
-from django.shortcuts import get_object_or_404
 
 from api.validators import validate_username
 from api_yamdb.settings import BANNED_SYMBOLS
@@ -20,19 +19,6 @@ class ReviewSerializers(serializers.ModelSerializer):
         model = Review
         read_only_fields = ['title']
 
-    def validate(self, data):
-        if self.context['request'].method == 'POST':
-            title_id = (
-                self.context['request'].parser_context['kwargs']['title_id']
-            )
-            author = self.context['request'].user
-            title = get_object_or_404(Title, id=title_id)
-            if Review.objects.filter(
-                author=author, title=title
-            ).exists():
-                raise serializers.ValidationError(['Нельзя'])
-        return data
-
 
 class CommentSerializers(serializers.ModelSerializer):
     author = serializers.StringRelatedField(
@@ -139,3 +125,23 @@ class TitleWriteSerializer(serializers.ModelSerializer):
             'year',
             'description',
         )
+
+
+class TitleBulkSerializer(serializers.ModelSerializer):
+    """One item of a bulk request; slugs are resolved by the view."""
+    id = serializers.IntegerField(required=False)
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+    class Meta:
+        model = Title
+        fields = (
+            'id',
+            'name',
+            'genre',
+            'category',
+            'year',
+            'description',
+        )
+        # ``year`` is blank=True on the model but the column is NOT NULL.
+        extra_kwargs = {'year': {'required': True}}
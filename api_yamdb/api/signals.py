@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+from .authentication import forget_user
+from .cache import invalidate
+
+CACHE_NAMESPACES = {
+    Title: ('titles',),
+    Genre: ('genres', 'titles'),
+    Category: ('categories', 'titles'),
+    Review: ('titles', 'reviews'),
+    Comment: ('comments',),
+}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_responses(sender, **kwargs):
+    namespaces = CACHE_NAMESPACES.get(sender)
+    if namespaces:
+        invalidate(*namespaces)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate('titles')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, created=False, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_user(user_id))
+    if not created:
+        # Reviews and comments show their author's username.
+        invalidate('reviews', 'comments')
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from .mixins import ListResponseMixin
+
+JSON_RENDERER = JSONRenderer()
+
+
+def accepts_json(request):
+    """Requests the browsable API would not answer with HTML."""
+    return ('format' not in request.GET
+            and 'text/html' not in request.META.get('HTTP_ACCEPT', ''))
+
+
+def paginate_lazily(paginator, queryset, request, view):
+    """``paginate_queryset`` that leaves the rows of the page unread and the
+    paginator ready to build the next and previous links.
+
+    Streamed pages always carry the count, ``count=false`` is ignored.
+    """
+    paginator.request = request
+    paginator.counted = True
+    paginator.page = paginator.get_page(queryset, request, view)
+    return paginator.page.object_list
+
+
+def iter_chunks(rows, chunk_size):
+    """Read a queryset with a server-side cursor, ``chunk_size`` rows at a
+    time; ``iterator()`` ignores ``prefetch_related``, so it is applied to
+    every chunk."""
+    lookups = rows._prefetch_related_lookups
+    iterator = rows.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        if lookups:
+            prefetch_related_objects(chunk, *lookups)
+        yield chunk
+
+
+def stream_json(envelope, chunks, serialize):
+    """Yield the JSON of ``envelope`` with its ``results`` streamed.
+
+    The bytes are the same as ``JSONRenderer`` would produce for the whole
+    response, and without an envelope the results are a bare list.
+    """
+    if envelope is None:
+        head, tail = b'[', b']'
+    else:
+        rendered = JSON_RENDERER.render(envelope)
+        head, tail = rendered[:-len(b']}')], b']}'
+    yield head
+    separator = b''
+    for chunk in chunks:
+        items = b','.join(
+            JSON_RENDERER.render(item) for item in serialize(chunk)
+        )
+        if items:
+            yield separator + items
+            separator = b','
+    yield tail
+
+
+class StreamingListMixin(ListResponseMixin):
+    """Stream list pages of ``API_STREAMING_PAGE_SIZE`` rows and more, or
+    of the largest page size the paginator allows.
+
+    Rows are read and serialized ``streaming_chunk_size`` at a time, so the
+    memory a page takes no longer grows with the page size. Cursor pages,
+    the browsable API and smaller pages are rendered as usual.
+    """
+    streaming_chunk_size = 200
+
+    def is_streamed(self):
+        paginator = self.paginator
+        if not accepts_json(self.request):
+            return False
+        if paginator is None:
+            return True
+        if getattr(paginator, 'get_cursor_paginator', None) and (
+            paginator.get_cursor_paginator(self.request) is not None
+        ):
+            return False
+        page_size = paginator.get_page_size(self.request)
+        return page_size is not None and page_size >= min(
+            settings.API_STREAMING_PAGE_SIZE,
+            paginator.max_page_size or settings.API_STREAMING_PAGE_SIZE,
+        )
+
+    def get_list_response(self, queryset):
+        if not self.is_streamed():
+            return super().get_list_response(queryset)
+        envelope = None
+        if self.paginator is not None:
+            queryset = paginate_lazily(
+                self.paginator, queryset, self.request, self
+            )
+            envelope = OrderedDict([
+                ('count', self.paginator.page.paginator.count),
+                ('next', self.paginator.get_next_link()),
+                ('previous', self.paginator.get_previous_link()),
+                ('results', []),
+            ])
+        response = StreamingHttpResponse(
+            stream_json(
+                envelope,
+                iter_chunks(queryset, self.streaming_chunk_size),
+                self.serialize_list,
+            ),
+            content_type=JSON_RENDERER.media_type,
+        )
+        response['Vary'] = 'Accept'
+        return response
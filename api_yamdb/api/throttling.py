@@ -0,0 +1,114 @@
+import hashlib
+import time
+from contextlib import contextmanager
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from .cache import get_cache
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Token buckets per client IP and per identity field of the request.
+
+    A bucket holds up to ``num_requests`` tokens and refills at
+    ``num_requests / duration`` tokens a second, so a client may burst up
+    to the rate and is then held to it. A request takes a token from each
+    of its buckets and is refused if any of them is empty. The buckets
+    live in the API cache and are updated under a lock taken with
+    ``cache.add``, so concurrent requests cannot spend the same token;
+    a request that cannot get the lock in time is refused. No database
+    access.
+
+    Client IPs come from DRF's ``get_ident``, which trusts only
+    ``NUM_PROXIES`` entries of ``X-Forwarded-For``.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+    lock_format = '%s:lock'
+    # Seconds; cache timeouts are whole seconds on memcached.
+    lock_timeout = 1
+    lock_attempts = 20
+    lock_wait = 0.005
+    ident_fields = ()
+
+    def __init__(self):
+        super().__init__()
+        self.cache = get_cache()
+        self.wait_seconds = None
+
+    def get_idents(self, request):
+        idents = [f'ip:{self.get_ident(request)}']
+        data = request.data if hasattr(request.data, 'get') else {}
+        for field in self.ident_fields:
+            value = data.get(field)
+            if value:
+                # Bots pick the values, keep the keys short and safe.
+                digest = hashlib.md5(
+                    str(value).strip().lower().encode()
+                ).hexdigest()
+                idents.append(f'{field}:{digest}')
+        return idents
+
+    @contextmanager
+    def locked(self, keys):
+        """Hold the locks of ``keys``, yields whether they were taken."""
+        taken = []
+        try:
+            for lock in sorted(self.lock_format % key for key in keys):
+                for _ in range(self.lock_attempts):
+                    if self.cache.add(lock, 1, self.lock_timeout):
+                        taken.append(lock)
+                        break
+                    time.sleep(self.lock_wait)
+                else:
+                    yield False
+                    return
+            yield True
+        finally:
+            self.cache.delete_many(taken)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        keys = [
+            self.cache_format % {'scope': self.scope, 'ident': ident}
+            for ident in self.get_idents(request)
+        ]
+        with self.locked(keys) as locked:
+            if not locked:
+                self.wait_seconds = self.lock_timeout
+                return False
+            return self.take_token(keys)
+
+    def take_token(self, keys):
+        now = self.timer()
+        refill = self.num_requests / self.duration
+        stored = self.cache.get_many(keys)
+        buckets = {}
+        for key in keys:
+            tokens, updated = stored.get(key, (self.num_requests, now))
+            buckets[key] = min(
+                self.num_requests, tokens + (now - updated) * refill
+            )
+        emptiest = min(buckets.values())
+        if emptiest < 1:
+            self.wait_seconds = (1 - emptiest) / refill
+            return False
+        # A bucket left alone for ``duration`` is full again.
+        self.cache.set_many(
+            {key: (tokens - 1, now) for key, tokens in buckets.items()},
+            self.duration,
+        )
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class SignupThrottle(TokenBucketThrottle):
+    scope = 'signup'
+    ident_fields = ('username', 'email')
+
+
+class TokenThrottle(TokenBucketThrottle):
+    scope = 'token'
+    ident_fields = ('username',)
@@ -2,9 +2,9 @@ from django.urls import include, path
 
 from rest_framework.routers import SimpleRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UserAuthenticationView,
-                    UserRegisterView, UserViewSet)
+from .views import (CacheStatsView, CategoryViewSet, CommentViewSet,
+                    GenreViewSet, MetricsView, ReviewViewSet, TitleViewSet,
+                    UserAuthenticationView, UserRegisterView, UserViewSet)
 
 app_name = 'api'
 
@@ -35,4 +35,6 @@ urlpatterns = [
     path('v1/auth/signup/',
          UserRegisterView.as_view()),
     path('v1/auth/token/', UserAuthenticationView.as_view()),
+    path('v1/cache/stats/', CacheStatsView.as_view()),
+    path('v1/metrics/', MetricsView.as_view()),
 ]
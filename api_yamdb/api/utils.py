@@ -1,13 +1,24 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
 
+from users.models import OutgoingEmail
+
+FROM_EMAIL = 'team62@practicum.com'
+
 
 def send_code(user):
     confirmation_code = default_token_generator.make_token(user)
+    email = {
+        'subject': 'Код подтверждения',
+        'message': f'Ваш код подтверждения: {confirmation_code}',
+        'from_email': FROM_EMAIL,
+    }
+    if settings.EMAIL_QUEUE_ENABLED:
+        OutgoingEmail.objects.create(recipient=user.email, **email)
+        return
     send_mail(
-        subject='Код подтверждения',
-        message=f'Ваш код подтверждения: {confirmation_code}',
-        from_email='team62@practicum.com',
         recipient_list=[user.email],
         fail_silently=False,
+        **email,
     )
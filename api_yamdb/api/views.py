@@ -1,27 +1,42 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin)
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Review, Title
+from reviews.facets import get_facet_counts
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.summaries import get_summaries, with_summaries
 
 from users.models import User
 
+from .bulk import save_titles
+from .cache import get_stats
+from .export import HEADERS, CSVRenderer, NDJSONRenderer, stream_export
 from .filters import TitleFilter
+from .metrics import get_snapshot
+from .mixins import CachedResponseMixin, ConditionalGetMixin
+from .pagination import (CommentPagination, ReviewPagination,
+                         TitlePagination, UserPagination)
 from .permissions import (AdminOrReadOnly, IsAdminOrSuperUser,
                           IsAuthenticatedUser)
 from .serializers import (CategorySerializer, CommentSerializers,
@@ -29,12 +44,19 @@ from .serializers import (CategorySerializer, CommentSerializers,
                           TitleReadSerializer, TitleWriteSerializer,
                           UserAuthSerializer, UserRegisterSerializer,
                           UserSerializer)
+from .streaming import StreamingListMixin
+from .throttling import SignupThrottle, TokenThrottle
 from .utils import send_code
 
 
-class TitleViewSet(ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).all()
+class TitleViewSet(CachedResponseMixin, ConditionalGetMixin,
+                   StreamingListMixin, ModelViewSet):
+    cache_namespace = 'titles'
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    )
     permission_classes = (AdminOrReadOnly, IsAuthenticatedUser,)
+    pagination_class = TitlePagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
 
@@ -43,9 +65,114 @@ class TitleViewSet(ModelViewSet):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    def get_list_response(self, queryset):
+        """Render the page from ``TitleSummary`` instead of serializing
+        titles with their categories, genres and ratings."""
+        return super().get_list_response(with_summaries(queryset))
+
+    def serialize_list(self, rows):
+        return get_summaries(rows)
+
+    @action(methods=['get'], detail=False)
+    def facets(self, request):
+        filterset = self.filterset_class(
+            request.query_params, queryset=self.get_queryset()
+        )
+        if not filterset.is_valid():
+            return Response(filterset.errors,
+                            status=status.HTTP_400_BAD_REQUEST)
+        params = filterset.form.cleaned_data
+        if params.get('name') or params.get('search'):
+            counts = self.get_filtered_facet_counts(request.query_params)
+        else:
+            counts = get_facet_counts(
+                genre=params.get('genre'),
+                category=params.get('category'),
+                year=params.get('year'),
+            )
+        return Response(counts, status=status.HTTP_200_OK)
+
+    @action(methods=['post'], detail=False)
+    def bulk(self, request):
+        """Create titles without an ``id`` and update the ones with it."""
+        if not isinstance(request.data, list):
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Ожидается список произведений'
+            ]})
+        if len(request.data) > settings.TITLE_BULK_MAX_ITEMS:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Не больше {} произведений за запрос'.format(
+                    settings.TITLE_BULK_MAX_ITEMS
+                )
+            ]})
+        ids, errors = save_titles(request.data)
+        results = [
+            {'id': ids[index]} if index in ids
+            else {'errors': errors[index]}
+            for index in range(len(request.data))
+        ]
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif ids:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(results, status=response_status)
 
-class CategoryGenreViewSet(CreateModelMixin, ListModelMixin,
-                           DestroyModelMixin, GenericViewSet):
+    @action(
+        methods=['get'],
+        detail=False,
+        permission_classes=(IsAdminOrSuperUser,),
+        renderer_classes=(NDJSONRenderer, CSVRenderer),
+    )
+    def export(self, request):
+        """Stream a whole table of the catalogue in id order.
+
+        ``table`` is one of the files ``import_csv`` reads and ``after``
+        resumes an interrupted export after the last id received.
+        """
+        table = request.query_params.get('table', 'titles')
+        if table not in HEADERS:
+            raise ValidationError({'table': [
+                'Доступные таблицы: {}'.format(', '.join(HEADERS))
+            ]})
+        after = request.query_params.get('after', '0')
+        if not after.isdigit():
+            raise ValidationError({'after': ['Ожидается id записи']})
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            stream_export(table, renderer.format, int(after)),
+            content_type=f'{renderer.media_type}; charset=utf-8',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{table}.{renderer.format}"'
+        )
+        return response
+
+    def get_filtered_facet_counts(self, query_params):
+        """Count facets over the filtered titles when the counts table
+        cannot answer, e.g. for name and full-text search filters."""
+        counts = {}
+        for facet, field in (('genre', 'genre__slug'),
+                             ('category', 'category__slug'),
+                             ('year', 'year')):
+            params = query_params.copy()
+            params.pop(facet, None)
+            titles = self.filterset_class(
+                params, queryset=Title.objects.all()
+            ).qs.order_by()
+            counts[facet] = {
+                row[field]: row['titles']
+                for row in titles.values(field).annotate(
+                    titles=Count('id', distinct=True)
+                ).order_by(field)
+                if row[field] is not None
+            }
+        return counts
+
+
+class CategoryGenreViewSet(CachedResponseMixin, CreateModelMixin,
+                           ListModelMixin, DestroyModelMixin, GenericViewSet):
     permission_classes = (AdminOrReadOnly,)
     filter_backends = (SearchFilter,)
     search_fields = ('name',)
@@ -53,6 +180,7 @@ class CategoryGenreViewSet(CreateModelMixin, ListModelMixin,
 
 
 class CategoryViewSet(CategoryGenreViewSet):
+    cache_namespace = 'categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
@@ -64,6 +192,7 @@ class CategoryViewSet(CategoryGenreViewSet):
 
 
 class GenreViewSet(CategoryGenreViewSet):
+    cache_namespace = 'genres'
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
 
@@ -74,8 +203,23 @@ class GenreViewSet(CategoryGenreViewSet):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
 
+class CacheStatsView(APIView):
+    permission_classes = (IsAdminOrSuperUser,)
+
+    def get(self, request):
+        return Response(get_stats(), status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    permission_classes = (IsAdminOrSuperUser,)
+
+    def get(self, request):
+        return Response(get_snapshot(), status=status.HTTP_200_OK)
+
+
 class UserRegisterView(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (SignupThrottle,)
 
     def post(self, request):
         serializer = UserRegisterSerializer(data=request.data)
@@ -98,6 +242,7 @@ class UserRegisterView(APIView):
 class UserAuthenticationView(APIView):
     queryset = User.objects.all()
     permission_classes = (AllowAny,)
+    throttle_classes = (TokenThrottle,)
 
     def get_tokens_for_user(self, user):
         refresh = RefreshToken.for_user(user)
@@ -123,11 +268,12 @@ class UserAuthenticationView(APIView):
         return Response(token, status=status.HTTP_200_OK)
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(StreamingListMixin, ModelViewSet):
     lookup_field = 'username'
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAdminOrSuperUser,)
+    pagination_class = UserPagination
     filter_backends = (SearchFilter,)
     search_fields = ('username',)
     http_method_names = [
@@ -145,41 +291,92 @@ class UserViewSet(ModelViewSet):
         permission_classes=[IsAuthenticated],
     )
     def patch_me(self, request):
-        username = request.user.username
-        user = get_object_or_404(User, username=username)
+        if request.method == 'GET':
+            serializer = UserSerializer(request.user)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        # request.user may come from the cache and lag behind the table,
+        # its role and flags must never be written back.
+        user = get_object_or_404(User, pk=request.user.pk)
         serializer = UserSerializer(user,
                                     data=request.data,
                                     partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save(role=request.user.role)
+        serializer.save(role=user.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(CachedResponseMixin, ConditionalGetMixin,
+                    StreamingListMixin, ModelViewSet):
+    cache_namespace = 'reviews'
     serializer_class = ReviewSerializers
     permission_classes = (IsAuthenticatedUser, IsAuthenticatedOrReadOnly,)
+    pagination_class = ReviewPagination
 
-    @property
+    @cached_property
     def title(self):
         return get_object_or_404(Title, id=self.kwargs.get('title_id'))
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('list', 'create'):
+            context['title'] = self.title
+        return context
+
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.title)
+        # Rating counters are kept by ``reviews.signals``.
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=self.title)
+        except IntegrityError:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Нельзя оставить второй отзыв на одно произведение'
+            ]})
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
 
     def get_queryset(self):
-        return self.title.reviews.all()
-
-
-class CommentViewSet(ModelViewSet):
+        if self.action == 'list':
+            queryset = self.title.reviews.all()
+        else:
+            # Detail routes 404 on the review itself, no title lookup needed.
+            queryset = Review.objects.filter(
+                title_id=self.kwargs.get('title_id')
+            )
+        return queryset.select_related('author')
+
+
+class CommentViewSet(CachedResponseMixin, ConditionalGetMixin,
+                     StreamingListMixin, ModelViewSet):
+    cache_namespace = 'comments'
     serializer_class = CommentSerializers
     permission_classes = (IsAuthenticatedUser, IsAuthenticatedOrReadOnly,)
+    pagination_class = CommentPagination
 
-    @property
+    @cached_property
     def review(self):
-        return get_object_or_404(Review, id=self.kwargs.get('review_id'))
+        return get_object_or_404(
+            Review,
+            id=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'),
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('list', 'create'):
+            context['review'] = self.review
+        return context
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.review)
 
     def get_queryset(self):
-        return self.review.comments.all()
+        if self.action == 'list':
+            queryset = self.review.comments.all()
+        else:
+            queryset = Comment.objects.filter(
+                review_id=self.kwargs.get('review_id'),
+                review__title_id=self.kwargs.get('title_id'),
+            )
+        return queryset.select_related('author')
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+# Imported after setup, like ``django.core.asgi.get_asgi_application``.
+# The handler reads streamed list pages and exports in the sync thread,
+# Django 3.2 would read them on the event loop, where the ORM cannot run.
+from api.handlers import ASGIHandler  # noqa: E402
+
+application = ASGIHandler()
@@ -35,6 +35,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.QueryTimingMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -44,6 +46,8 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+API_METRICS_ENABLED = os.getenv('API_METRICS_ENABLED', 'True') == 'True'
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -68,13 +72,76 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
+# DB_ENGINE=django.db.backends.postgresql for PostgreSQL, or
+# api.backends.postgresql_pool to keep an in-process pool of
+# DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections (use DB_CONN_MAX_AGE=0).
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': os.getenv('DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+        'USER': os.getenv('POSTGRES_USER', ''),
+        'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', ''),
+        'PORT': os.getenv('DB_PORT', ''),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'HEALTH_CHECKS': os.getenv('DB_HEALTH_CHECKS', 'True') == 'True',
+        'HEALTH_CHECK_INTERVAL': int(os.getenv('DB_HEALTH_CHECK_INTERVAL', 30)),
+        'POOL': {
+            'MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        },
+    }
+}
+
+# DB_REPLICAS lists read replicas, as file names for SQLite and as hosts
+# otherwise; they become the replica1..N aliases.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1
+):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        ('NAME' if 'sqlite' in DATABASES['default']['ENGINE'] else 'HOST'):
+            replica.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['api.routers.ReplicaRouter']
+
+# round-robin or least-latency
+DATABASE_REPLICA_SELECTION = os.getenv('DB_REPLICA_SELECTION', 'round-robin')
+
+# Seconds a client keeps reading from the primary after a write.
+DATABASE_REPLICA_STICKY = int(os.getenv('DB_REPLICA_STICKY', 10))
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+}
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'yamdb'),
     }
 }
 
+API_CACHE_ALIAS = 'default'
+
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 60 * 15))
+
+# Writes only invalidate the per-process LocMemCache of the worker that
+# handled them, so its responses expire much sooner.
+API_CACHE_LOCAL_TIMEOUT = int(os.getenv('API_CACHE_LOCAL_TIMEOUT', 5))
+
 
 # Password validation
 
@@ -99,10 +166,18 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageSizePagination',
     'PAGE_SIZE': 4,
+    # X-Forwarded-For entries added by our own proxies; client IPs are
+    # taken from REMOTE_ADDR by default and cannot be spoofed.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
+    # Token buckets per IP and per username/email, see api.throttling.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': os.getenv('THROTTLE_SIGNUP_RATE', '20/min'),
+        'token': os.getenv('THROTTLE_TOKEN_RATE', '20/min'),
+    },
 }
 
 SIMPLE_JWT = {
@@ -110,6 +185,13 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 30))
+
+TITLE_BULK_MAX_ITEMS = int(os.getenv('TITLE_BULK_MAX_ITEMS', 50000))
+
+# List pages of this many rows and more are streamed row by row.
+API_STREAMING_PAGE_SIZE = int(os.getenv('API_STREAMING_PAGE_SIZE', 500))
+
 # Internationalization
 
 LANGUAGE_CODE = 'en-us'
@@ -134,6 +216,16 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# Deliver confirmation emails through the outbox table and the
+# send_emails worker instead of sending them inside the request.
+EMAIL_QUEUE_ENABLED = os.getenv('EMAIL_QUEUE_ENABLED', 'True') == 'True'
+
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv('EMAIL_QUEUE_MAX_ATTEMPTS', 5))
+
+EMAIL_QUEUE_RETRY_DELAY = int(os.getenv('EMAIL_QUEUE_RETRY_DELAY', 60))
+
+EMAIL_QUEUE_LEASE = int(os.getenv('EMAIL_QUEUE_LEASE', 300))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 ROLES = [
@@ -0,0 +1,171 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .models import Category, Genre, Title, TitleFacet
+
+
+def get_cells(category_id, year, genre_ids):
+    """Facet cells a title with these attributes is counted in."""
+    return [(None, category_id, year)] + [
+        (genre_id, category_id, year) for genre_id in genre_ids
+    ]
+
+
+def create_cells(cells):
+    """Insert missing cells with a zero count; cells another writer has
+    just created are left alone thanks to the unique constraints."""
+    TitleFacet.objects.bulk_create(
+        (
+            TitleFacet(genre_id=genre_id, category_id=category_id,
+                       year=year, count=0)
+            for genre_id, category_id, year in cells
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def add_counts(cells, delta):
+    changes = Counter()
+    for cell in cells:
+        changes[cell] += delta
+    for (genre_id, category_id, year), change in changes.items():
+        if not change:
+            continue
+        cell = TitleFacet.objects.filter(
+            genre_id=genre_id, category_id=category_id, year=year
+        )
+        if not cell.update(count=F('count') + change):
+            create_cells([(genre_id, category_id, year)])
+            cell.update(count=F('count') + change)
+
+
+def nullable_in(field, values):
+    condition = Q(**{f'{field}__in': values - {None}})
+    if None in values:
+        condition |= Q(**{f'{field}__isnull': True})
+    return condition
+
+
+def apply_counts(changes):
+    """Apply a Counter of cell deltas with a constant number of queries.
+
+    Meant for bulk writes, which touch too many cells for ``add_counts``.
+    """
+    changes = {cell: delta for cell, delta in changes.items() if delta}
+    if not changes:
+        return
+    create_cells(changes)
+    genre_ids, category_ids, years = (set(values) for values in zip(*changes))
+    cells = TitleFacet.objects.select_for_update().filter(
+        nullable_in('genre_id', genre_ids),
+        nullable_in('category_id', category_ids),
+        year__in=years,
+    )
+    changed = []
+    for cell in cells:
+        delta = changes.get((cell.genre_id, cell.category_id, cell.year))
+        if delta:
+            cell.count += delta
+            changed.append(cell)
+    TitleFacet.objects.bulk_update(changed, ('count',), batch_size=1000)
+
+
+def move_category_to_none(category_id):
+    """Titles keep their cells when their category is deleted."""
+    cells = TitleFacet.objects.filter(category_id=category_id)
+    counts = list(cells.values_list('genre_id', 'year', 'count'))
+    cells.delete()
+    for genre_id, year, count in counts:
+        add_counts([(genre_id, None, year)], count)
+
+
+def rebuild_facets():
+    with transaction.atomic():
+        TitleFacet.objects.all().delete()
+        by_category = Title.objects.values('category_id', 'year').annotate(
+            titles=Count('id')
+        )
+        by_genre = Title.genre.through.objects.values(
+            'genre_id', 'title__category_id', 'title__year'
+        ).annotate(titles=Count('title_id'))
+        TitleFacet.objects.bulk_create(
+            [
+                TitleFacet(
+                    category_id=row['category_id'],
+                    year=row['year'],
+                    count=row['titles'],
+                )
+                for row in by_category
+            ] + [
+                TitleFacet(
+                    genre_id=row['genre_id'],
+                    category_id=row['title__category_id'],
+                    year=row['title__year'],
+                    count=row['titles'],
+                )
+                for row in by_genre
+            ],
+            batch_size=1000,
+        )
+
+
+def sum_by(cells, field):
+    return {
+        row[field]: row['titles']
+        for row in cells.values(field).annotate(
+            titles=Sum('count')
+        ).filter(titles__gt=0).order_by(field)
+        if row[field] is not None
+    }
+
+
+def get_facet_counts(genre=None, category=None, year=None):
+    """Title counts per genre, category and year slug from TitleFacet.
+
+    Each facet applies every filter except its own, so the counts show
+    what choosing another value of that facet would return.
+    """
+    genre_id = category_id = None
+    if genre:
+        genre_id = Genre.objects.filter(slug=genre).values_list(
+            'id', flat=True
+        ).first() or -1
+    if category:
+        category_id = Category.objects.filter(slug=category).values_list(
+            'id', flat=True
+        ).first() or -1
+    cells = TitleFacet.objects.all()
+    if genre_id is not None:
+        by_genre = cells.filter(genre_id=genre_id)
+    else:
+        by_genre = cells.filter(genre_id__isnull=True)
+    if category_id is not None:
+        cells = cells.filter(category_id=category_id)
+        by_genre_and_category = by_genre.filter(category_id=category_id)
+    else:
+        by_genre_and_category = by_genre
+    if year is not None:
+        cells = cells.filter(year=year)
+        by_genre = by_genre.filter(year=year)
+
+    genre_counts = sum_by(cells.filter(genre_id__isnull=False), 'genre_id')
+    category_counts = sum_by(by_genre, 'category_id')
+    slugs = dict(Genre.objects.filter(
+        id__in=genre_counts).values_list('id', 'slug'))
+    category_slugs = dict(Category.objects.filter(
+        id__in=category_counts).values_list('id', 'slug'))
+    return {
+        'genre': {
+            slugs[key]: value
+            for key, value in genre_counts.items() if key in slugs
+        },
+        'category': {
+            category_slugs[key]: value
+            for key, value in category_counts.items()
+            if key in category_slugs
+        },
+        'year': sum_by(by_genre_and_category, 'year'),
+    }
@@ -0,0 +1,220 @@
+import csv
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from itertools import islice
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management import BaseCommand, call_command
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+
+BATCH_SIZE = 5000
+
+# Models are referenced by label so that worker processes can import this
+# module before Django is set up.
+TABLES = (
+    ('users.User', 'users.csv'),
+    ('reviews.Category', 'category.csv'),
+    ('reviews.Genre', 'genre.csv'),
+    ('reviews.Title', 'titles.csv'),
+    ('reviews.Title_genre', 'genre_title.csv'),
+    ('reviews.Review', 'review.csv'),
+    ('reviews.Comment', 'comments.csv'),
+)
+
+
+def get_dependencies():
+    """Build the table DAG from the foreign keys between imported models."""
+    models = {apps.get_model(label): label for label, _ in TABLES}
+    return {
+        label: {
+            models[field.related_model]
+            for field in model._meta.concrete_fields
+            if field.many_to_one
+            and field.related_model in models
+            and field.related_model is not model
+        }
+        for model, label in models.items()
+    }
+
+
+def get_import_order(dependencies):
+    order, done = [], set()
+    while len(order) < len(dependencies):
+        ready = [
+            label for label, parents in dependencies.items()
+            if label not in done and parents <= done
+        ]
+        if not ready:
+            raise ValueError('Circular dependency between CSV tables')
+        order.extend(ready)
+        done.update(ready)
+    return order
+
+
+def get_columns(model, header):
+    """Map CSV columns to model attnames, remembering FK targets."""
+    columns = []
+    for column in header:
+        field = model._meta.get_field(column)
+        target = field.related_model if field.many_to_one else None
+        columns.append((column, field.attname, target))
+    return columns
+
+
+@contextmanager
+def dates_from_file(model, columns):
+    """Let ``auto_now_add`` fields present in the file keep its values;
+    ``bulk_create`` would stamp them with the import time."""
+    attnames = {attname for _, attname, _ in columns}
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False) and field.attname in attnames
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def import_table(model, path, batch_size):
+    """Stream one CSV file into ``model``; returns imported/skipped rows."""
+    with open(path, 'r', encoding='utf-8', newline='') as import_csv_file:
+        reader = csv.reader(import_csv_file)
+        columns = get_columns(model, next(reader))
+        known_ids = {
+            target: set(target.objects.values_list('pk', flat=True))
+            for _, _, target in columns
+            if target is not None
+        }
+        imported = skipped = 0
+        with dates_from_file(model, columns), transaction.atomic():
+            while True:
+                batch = []
+                for row in islice(reader, batch_size):
+                    data = {}
+                    for (column, attname, target), value in zip(columns, row):
+                        if target is not None:
+                            value = int(value) if value else None
+                            if (value is not None
+                                    and value not in known_ids[target]):
+                                break
+                        data[attname] = value
+                    else:
+                        batch.append(model(**data))
+                        continue
+                    skipped += 1
+                if not batch:
+                    break
+                model.objects.bulk_create(batch, batch_size=batch_size)
+                imported += len(batch)
+    return imported, skipped
+
+
+def init_worker():
+    django.setup()
+    connections.close_all()
+
+
+def run_import(label, path, batch_size):
+    started = time.monotonic()
+    try:
+        imported, skipped = import_table(
+            apps.get_model(label), path, batch_size
+        )
+    finally:
+        connections.close_all()
+    return imported, skipped, time.monotonic() - started
+
+
+class Command(BaseCommand):
+    help = 'Imports the CSV fixtures from static/data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Import independent tables in this many processes',
+        )
+
+    def handle(self, *args, **options):
+        self.files = dict(TABLES)
+        self.path = options['path']
+        self.batch_size = options['batch_size']
+        dependencies = get_dependencies()
+        workers = options['workers']
+        if workers > 1 and connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                'SQLite allows a single writer, importing sequentially')
+            )
+            workers = 1
+        if workers > 1:
+            self.import_parallel(dependencies, workers)
+        else:
+            for label in get_import_order(dependencies):
+                self.report(label, *run_import(*self.get_task(label)))
+        self.reset_sequences()
+        call_command('rebuild_ratings', stdout=self.stdout)
+        call_command('rebuild_facets', stdout=self.stdout)
+        call_command('rebuild_summaries', stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            'The data was uploaded successfully')
+        )
+
+    def get_task(self, label):
+        return (
+            label,
+            os.path.join(self.path, self.files[label]),
+            self.batch_size,
+        )
+
+    def import_parallel(self, dependencies, workers):
+        """Start every table as soon as all of its parents are committed."""
+        pending = dict(dependencies)
+        done = set()
+        running = {}
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker
+        ) as executor:
+            while pending or running:
+                for label, parents in list(pending.items()):
+                    if parents <= done:
+                        future = executor.submit(
+                            run_import, *self.get_task(label)
+                        )
+                        running[future] = label
+                        del pending[label]
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    label = running.pop(future)
+                    self.report(label, *future.result())
+                    done.add(label)
+
+    def report(self, label, imported, skipped, elapsed):
+        self.stdout.write(
+            f'{self.files[label]}: {imported} rows in {elapsed:.2f}s '
+            f'({imported / max(elapsed, 1e-6):.0f} rows/s), '
+            f'{skipped} skipped'
+        )
+
+    def reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [apps.get_model(label) for label, _ in TABLES]
+        )
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
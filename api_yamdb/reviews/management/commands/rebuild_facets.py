@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+
+from reviews.facets import rebuild_facets
+from reviews.models import TitleFacet
+
+
+class Command(BaseCommand):
+    help = 'Recalculates the genre/category/year title counts'
+
+    def handle(self, *args, **options):
+        rebuild_facets()
+        self.stdout.write(self.style.SUCCESS(
+            f'Title facets rebuilt, {TitleFacet.objects.count()} cell(s)')
+        )
@@ -0,0 +1,59 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from reviews.models import Title
+from reviews.summaries import refresh_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recalculates stored title ratings from reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report titles whose stored rating is out of sync',
+        )
+
+    def get_mismatches(self):
+        titles = Title.objects.annotate(
+            reviews_sum=Sum('reviews__score'),
+            reviews_count=Count('reviews'),
+        ).order_by('id')
+        for title in titles.iterator():
+            reviews_sum = title.reviews_sum or 0
+            if (title.rating_sum != reviews_sum
+                    or title.rating_count != title.reviews_count):
+                yield title, reviews_sum, title.reviews_count
+
+    def handle(self, *args, **options):
+        if options['check']:
+            mismatches = 0
+            for title, reviews_sum, reviews_count in self.get_mismatches():
+                mismatches += 1
+                self.stdout.write(
+                    f'Title {title.id}: stored {title.rating_sum}/'
+                    f'{title.rating_count}, actual '
+                    f'{reviews_sum}/{reviews_count}'
+                )
+            if mismatches:
+                raise CommandError(
+                    f'{mismatches} title rating(s) are out of sync'
+                )
+            self.stdout.write(self.style.SUCCESS(
+                'All title ratings are consistent')
+            )
+            return
+
+        mismatches = list(self.get_mismatches())
+        with transaction.atomic():
+            for title, reviews_sum, reviews_count in mismatches:
+                Title.objects.filter(id=title.id).update(
+                    rating_sum=reviews_sum,
+                    rating_count=reviews_count,
+                )
+            refresh_summaries(title.id for title, _, _ in mismatches)
+        self.stdout.write(self.style.SUCCESS(
+            f'Title ratings rebuilt, {len(mismatches)} title(s) updated')
+        )
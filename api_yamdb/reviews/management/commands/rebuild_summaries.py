@@ -0,0 +1,15 @@
+from django.core.management import BaseCommand
+
+from reviews.models import TitleSummary
+from reviews.summaries import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = 'Regenerates the title summaries served by the title list'
+
+    def handle(self, *args, **options):
+        rebuild_summaries()
+        self.stdout.write(self.style.SUCCESS(
+            f'Title summaries rebuilt, {TitleSummary.objects.count()} '
+            f'title(s)')
+        )
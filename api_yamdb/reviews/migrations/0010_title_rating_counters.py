@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 19:41
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating_counters(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    titles = Title.objects.annotate(
+        reviews_sum=Sum('reviews__score'),
+        reviews_count=Count('reviews'),
+    ).filter(reviews_count__gt=0)
+    for title in titles.iterator():
+        title.rating_sum = title.reviews_sum
+        title.rating_count = title.reviews_count
+        title.save(update_fields=('rating_sum', 'rating_count'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_auto_20230322_1739'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_rating_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+FTS_TABLE = 'reviews_title_fts'
+
+SEARCH_INDEX = 'reviews_title_search'
+
+SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(reviews_title.name, '') || ' ' || "
+    "coalesce(reviews_title.description, ''))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    # The SQLite triggers are (re)created by reviews.search on post_migrate.
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "name, description, content='reviews_title', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {SEARCH_INDEX} ON reviews_title '
+            f'USING GIN (({SEARCH_VECTOR}))'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for action in ('insert', 'update', 'delete'):
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{action}'
+            )
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {SEARCH_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_review_comment_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
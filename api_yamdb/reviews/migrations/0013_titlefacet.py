@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_title_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('genre_id', models.IntegerField(null=True)),
+                ('category_id', models.IntegerField(null=True)),
+                ('year', models.IntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'title facet',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titlefacet',
+            index=models.Index(fields=['genre_id', 'category_id', 'year'], name='title_facet_cell'),
+        ),
+    ]
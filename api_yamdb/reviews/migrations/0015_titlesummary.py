@@ -0,0 +1,54 @@
+# Generated by Django 3.2 on 2026-10-18 20:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_title_summaries(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleSummary = apps.get_model('reviews', 'TitleSummary')
+    titles = Title.objects.select_related('category').prefetch_related(
+        models.Prefetch('genre', apps.get_model(
+            'reviews', 'Genre').objects.order_by('slug'))
+    )
+    summaries = []
+    for title in titles:
+        category = title.category
+        summaries.append(TitleSummary(title_id=title.id, data={
+            'id': title.id,
+            'name': title.name,
+            'genre': [
+                {'name': genre.name, 'slug': genre.slug}
+                for genre in title.genre.all()
+            ],
+            'category': (
+                {'name': category.name, 'slug': category.slug}
+                if category is not None else None
+            ),
+            'year': title.year,
+            'rating': (title.rating_sum // title.rating_count
+                       if title.rating_count else None),
+            'description': title.description,
+        }))
+    TitleSummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_title_comment_updated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleSummary',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='reviews.title')),
+                ('data', models.JSONField()),
+            ],
+            options={
+                'verbose_name': 'title summary',
+            },
+        ),
+        migrations.RunPython(fill_title_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.2 on 2026-10-18 20:54
+
+from django.db import migrations, models
+
+
+def merge_duplicate_cells(apps, schema_editor):
+    TitleFacet = apps.get_model('reviews', 'TitleFacet')
+    duplicates = TitleFacet.objects.values(
+        'genre_id', 'category_id', 'year'
+    ).annotate(
+        cells=models.Count('id'), total=models.Sum('count')
+    ).filter(cells__gt=1)
+    for row in duplicates:
+        cells = TitleFacet.objects.filter(
+            genre_id=row['genre_id'],
+            category_id=row['category_id'],
+            year=row['year'],
+        ).order_by('id')
+        keep = cells.first()
+        cells.exclude(id=keep.id).delete()
+        TitleFacet.objects.filter(id=keep.id).update(count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0016_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_cells, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='titlefacet',
+            constraint=models.UniqueConstraint(fields=('genre_id', 'category_id', 'year'), name='title_facet_unique_cell'),
+        ),
+        migrations.AddConstraint(
+            model_name='titlefacet',
+            constraint=models.UniqueConstraint(condition=models.Q(genre_id__isnull=True), fields=('category_id', 'year'), name='title_facet_unique_no_genre'),
+        ),
+        migrations.AddConstraint(
+            model_name='titlefacet',
+            constraint=models.UniqueConstraint(condition=models.Q(category_id__isnull=True), fields=('genre_id', 'year'), name='title_facet_unique_no_category'),
+        ),
+        migrations.AddConstraint(
+            model_name='titlefacet',
+            constraint=models.UniqueConstraint(condition=models.Q(('category_id__isnull', True), ('genre_id__isnull', True)), fields=('year',), name='title_facet_unique_year'),
+        ),
+    ]
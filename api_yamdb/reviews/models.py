@@ -64,15 +64,97 @@ class Title(models.Model):
         verbose_name='category',
     )
     description = models.TextField(null=True, blank=True)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'title'
         default_related_name = 'titles'
         ordering = ('year',)
+        indexes = (
+            models.Index(fields=['year'], name='title_year'),
+            models.Index(fields=['updated'], name='title_updated'),
+            models.Index(fields=['category', 'year'],
+                         name='title_category_year'),)
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum // self.rating_count
+
+
+class TitleFacet(models.Model):
+    """Number of titles per genre, category and year.
+
+    Rows without a genre count every title of the category and year once,
+    rows with a genre count the titles having that genre. The table is
+    maintained by ``reviews.signals`` and rebuilt by ``rebuild_facets``.
+    """
+    genre_id = models.IntegerField(null=True)
+    category_id = models.IntegerField(null=True)
+    year = models.IntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'title facet'
+        indexes = (
+            models.Index(fields=['genre_id', 'category_id', 'year'],
+                         name='title_facet_cell'),)
+        # NULLs are distinct in unique indexes, so every combination of
+        # missing genre and category gets its own partial constraint.
+        constraints = (
+            models.UniqueConstraint(
+                fields=['genre_id', 'category_id', 'year'],
+                name='title_facet_unique_cell',
+            ),
+            models.UniqueConstraint(
+                fields=['category_id', 'year'],
+                condition=models.Q(genre_id__isnull=True),
+                name='title_facet_unique_no_genre',
+            ),
+            models.UniqueConstraint(
+                fields=['genre_id', 'year'],
+                condition=models.Q(category_id__isnull=True),
+                name='title_facet_unique_no_category',
+            ),
+            models.UniqueConstraint(
+                fields=['year'],
+                condition=models.Q(genre_id__isnull=True,
+                                   category_id__isnull=True),
+                name='title_facet_unique_year',
+            ),)
+
+    def __str__(self):
+        return f'{self.genre_id, self.category_id, self.year}: {self.count}'
+
+
+class TitleSummary(models.Model):
+    """Title as rendered by the list endpoint, one row per title.
+
+    ``data`` holds the ``TitleReadSerializer`` representation, so a page of
+    titles is rendered without touching categories, genres or reviews. The
+    rows are refreshed by ``reviews.signals`` and rebuilt by
+    ``rebuild_summaries``.
+    """
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='summary',
+    )
+    data = models.JSONField()
+
+    class Meta:
+        verbose_name = 'title summary'
+
+    def __str__(self):
+        return str(self.data.get('name'))
+
 
 class Review(models.Model):
     title = models.ForeignKey(Title,
@@ -90,6 +172,14 @@ class Review(models.Model):
     def __str__(self):
         return f'{self.title.name, self.author.username, self.score}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        review = super().from_db(db, field_names, values)
+        if 'title_id' in field_names and 'score' in field_names:
+            # The rating counters of the title need the score as loaded.
+            review._loaded_rating = (review.title_id, review.score)
+        return review
+
     class Meta:
         default_related_name = "reviews"
         verbose_name = "review"
@@ -98,6 +188,9 @@ class Review(models.Model):
         constraints = (
             models.UniqueConstraint(fields=['author', 'title'],
                                     name='author_title'),)
+        indexes = (
+            models.Index(fields=['title', 'pub_date'],
+                         name='review_title_pub_date'),)
 
 
 class Comment(models.Model):
@@ -111,6 +204,7 @@ class Comment(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    updated = models.DateTimeField(auto_now=True)
     review = models.ForeignKey(
         Review,
         on_delete=models.CASCADE,
@@ -120,3 +214,6 @@ class Comment(models.Model):
         default_related_name = 'comments'
         verbose_name = "comments"
         default_related_name = "comments"
+        indexes = (
+            models.Index(fields=['review', 'pub_date'],
+                         name='comment_review_pub_date'),)
@@ -0,0 +1,103 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+FTS_TABLE = 'reviews_title_fts'
+
+# Keep in sync with the GIN index created in 0012_title_search.
+SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(reviews_title.name, '') || ' ' || "
+    "coalesce(reviews_title.description, ''))"
+)
+
+SQLITE_TRIGGERS = (
+    f'''CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF id, name, description ON reviews_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END''',
+)
+
+
+def get_terms(text):
+    return re.findall(r'\w+', text.lower())
+
+
+def ensure_search_index(using='default', **kwargs):
+    """Recreate the SQLite triggers feeding the title search index.
+
+    SQLite drops triggers together with the table, and Django rebuilds
+    ``reviews_title`` on most schema changes, so this runs after every
+    ``migrate``. The index content is rebuilt when triggers were missing.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        if FTS_TABLE not in tables:
+            return
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master "
+            "WHERE type = 'trigger' AND name LIKE %s",
+            [f'{FTS_TABLE}_%'],
+        )
+        if cursor.fetchone()[0] == len(SQLITE_TRIGGERS):
+            return
+        for sql in SQLITE_TRIGGERS:
+            cursor.execute(sql)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def search_titles(queryset, text):
+    """Filter titles by name and description words, best matches first.
+
+    Every word is matched as a prefix. SQLite uses the FTS5 index,
+    PostgreSQL the GIN index over ``SEARCH_VECTOR``.
+    """
+    terms = get_terms(text)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = reviews_title.id',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=[match],
+            select={'search_rank': f'{FTS_TABLE}.rank'},
+            order_by=['search_rank'],
+        )
+    if vendor == 'postgresql':
+        match = ' & '.join(f'{term}:*' for term in terms)
+        tsquery = "to_tsquery('simple', %s)"
+        return queryset.extra(
+            where=[f'{SEARCH_VECTOR} @@ {tsquery}'],
+            params=[match],
+            select={'search_rank': f'ts_rank({SEARCH_VECTOR}, {tsquery})'},
+            select_params=[match],
+            order_by=['-search_rank'],
+        )
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term) | Q(description__icontains=term)
+        )
+    return queryset
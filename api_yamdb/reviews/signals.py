@@ -0,0 +1,178 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.db.models import Count, F, Sum
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .facets import add_counts, get_cells, move_category_to_none
+from .models import Category, Genre, Review, Title, TitleFacet
+from .summaries import refresh_on_commit, refresh_ratings
+
+
+@receiver(pre_save, sender=Title)
+def remember_facet_cell(sender, instance, raw=False, **kwargs):
+    instance._facet_cell = None
+    if instance.pk is not None and not raw:
+        instance._facet_cell = Title.objects.filter(
+            pk=instance.pk
+        ).values_list('category_id', 'year').first()
+
+
+@receiver(post_save, sender=Title)
+def update_title_facets(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_cell = getattr(instance, '_facet_cell', None)
+    new_cell = (instance.category_id, instance.year)
+    if old_cell is None:
+        # A new title has no genres yet, they arrive through m2m_changed.
+        add_counts(get_cells(*new_cell, []), 1)
+    elif old_cell != new_cell:
+        genre_ids = list(instance.genre.values_list('id', flat=True))
+        add_counts(get_cells(*old_cell, genre_ids), -1)
+        add_counts(get_cells(*new_cell, genre_ids), 1)
+
+
+@receiver(pre_delete, sender=Title)
+def remove_title_facets(sender, instance, **kwargs):
+    genre_ids = list(instance.genre.values_list('id', flat=True))
+    add_counts(get_cells(instance.category_id, instance.year, genre_ids), -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_genre_facets(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        if reverse:
+            pk_set = set(instance.titles.values_list('id', flat=True))
+        else:
+            pk_set = set(instance.genre.values_list('id', flat=True))
+    elif action not in ('post_add', 'pre_remove') or not pk_set:
+        return
+    delta = 1 if action == 'post_add' else -1
+    if reverse:
+        cells = [
+            (instance.id, category_id, year)
+            for category_id, year in Title.objects.filter(
+                id__in=pk_set
+            ).values_list('category_id', 'year')
+        ]
+    else:
+        cells = [
+            (genre_id, instance.category_id, instance.year)
+            for genre_id in pk_set
+        ]
+    add_counts(cells, delta)
+
+
+@receiver(pre_delete, sender=Category)
+def move_category_facets(sender, instance, **kwargs):
+    move_category_to_none(instance.id)
+
+
+@receiver(pre_delete, sender=Genre)
+def remove_genre_facets(sender, instance, **kwargs):
+    TitleFacet.objects.filter(genre_id=instance.id).delete()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Genre)
+def touch_related_titles(sender, instance, created=False, raw=False,
+                         **kwargs):
+    """Renaming or deleting a category or genre changes how its titles are
+    shown, and so their validators."""
+    if created or raw:
+        return
+    if sender is Category:
+        titles = Title.objects.filter(category=instance)
+    else:
+        titles = Title.objects.filter(genre=instance)
+    titles.update(updated=timezone.now())
+
+
+@receiver(post_save, sender=Title)
+def refresh_title_summary(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_on_commit([instance.id])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def refresh_genre_summaries(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if action == 'pre_clear' and reverse:
+        # The cleared titles cannot be found once the links are gone.
+        refresh_on_commit(instance.titles.values_list('id', flat=True))
+    elif action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    elif not reverse:
+        refresh_on_commit([instance.id])
+    elif pk_set:
+        refresh_on_commit(pk_set)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def refresh_related_summaries(sender, instance, created, raw=False,
+                              **kwargs):
+    if not created and not raw:
+        refresh_on_commit(instance.titles.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Genre)
+def refresh_orphaned_summaries(sender, instance, **kwargs):
+    refresh_on_commit(instance.titles.values_list('id', flat=True))
+
+
+def update_rating(title_id, score_delta, count_delta):
+    Title.objects.filter(id=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        updated=timezone.now(),
+    )
+
+
+def recount_rating(title_id):
+    totals = Review.objects.filter(title_id=title_id).aggregate(
+        reviews_sum=Sum('score'), reviews_count=Count('id')
+    )
+    Title.objects.filter(id=title_id).update(
+        rating_sum=totals['reviews_sum'] or 0,
+        rating_count=totals['reviews_count'],
+        updated=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, created, raw=False, **kwargs):
+    """Keeps the rating counters and the summaries of rated titles up to
+    date; edits that leave the score alone touch neither."""
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_rating', None)
+    title_ids = {instance.title_id}
+    if created:
+        update_rating(instance.title_id, instance.score, 1)
+    elif loaded is None:
+        # Saved without being loaded, the old score is unknown.
+        recount_rating(instance.title_id)
+    elif loaded == (instance.title_id, instance.score):
+        return
+    else:
+        old_title_id, old_score = loaded
+        title_ids.add(old_title_id)
+        if old_title_id == instance.title_id:
+            update_rating(instance.title_id, instance.score - old_score, 0)
+        else:
+            update_rating(old_title_id, -old_score, -1)
+            update_rating(instance.title_id, instance.score, 1)
+    instance._loaded_rating = (instance.title_id, instance.score)
+    refresh_on_commit(title_ids, refresh_ratings)
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    """Also runs for reviews deleted in cascade, e.g. with their author."""
+    update_rating(instance.title_id, -instance.score, -1)
+    refresh_on_commit([instance.title_id], refresh_ratings)
@@ -0,0 +1,107 @@
+from django.db import transaction
+
+from .models import Title, TitleSummary
+
+BATCH_SIZE = 1000
+
+
+def summarize(title):
+    """Same fields and values as ``TitleReadSerializer``."""
+    category = title.category
+    return {
+        'id': title.id,
+        'name': title.name,
+        'genre': [
+            {'name': genre.name, 'slug': genre.slug}
+            for genre in title.genre.all()
+        ],
+        'category': (
+            {'name': category.name, 'slug': category.slug}
+            if category is not None else None
+        ),
+        'year': title.year,
+        'rating': title.rating,
+        'description': title.description,
+    }
+
+
+def create_summaries(titles):
+    TitleSummary.objects.bulk_create(
+        (
+            TitleSummary(title_id=title.id, data=summarize(title))
+            for title in titles
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+def get_titles(queryset):
+    return queryset.select_related('category').prefetch_related('genre')
+
+
+def with_summaries(titles):
+    """Rows of title id and summary, in the order of ``titles``."""
+    return titles.prefetch_related(None).values_list('id', 'summary__data')
+
+
+def get_summaries(rows):
+    """Summaries from ``with_summaries`` rows, e.g. one page of them.
+
+    Titles written without signals, e.g. with ``bulk_create``, may have no
+    summary yet; they are summarized on the fly.
+    """
+    rows = list(rows)
+    missing = [title_id for title_id, data in rows if data is None]
+    if missing:
+        fresh = {
+            title.id: summarize(title)
+            for title in get_titles(Title.objects.filter(id__in=missing))
+        }
+        rows = [(title_id, data or fresh[title_id])
+                for title_id, data in rows]
+    return [data for _, data in rows]
+
+
+def refresh_summaries(title_ids):
+    title_ids = list(set(title_ids))
+    with transaction.atomic():
+        for start in range(0, len(title_ids), BATCH_SIZE):
+            ids = title_ids[start:start + BATCH_SIZE]
+            TitleSummary.objects.filter(title_id__in=ids).delete()
+            create_summaries(get_titles(Title.objects.filter(id__in=ids)))
+
+
+def refresh_ratings(title_ids):
+    """Reviews only change the rating, patch it instead of a full refresh."""
+    summaries = TitleSummary.objects.filter(
+        title_id__in=list(title_ids)
+    ).select_related('title')
+    for summary in summaries:
+        summary.data['rating'] = summary.title.rating
+        TitleSummary.objects.filter(title_id=summary.title_id).update(
+            data=summary.data
+        )
+
+
+def refresh_on_commit(title_ids, refresh=refresh_summaries):
+    """Refresh once the surrounding write is committed.
+
+    Ratings are updated after the review itself is saved, so summaries
+    are only rebuilt from the final state of the transaction.
+    """
+    title_ids = list(title_ids)
+    if title_ids:
+        transaction.on_commit(lambda: refresh(title_ids))
+
+
+def rebuild_summaries():
+    with transaction.atomic():
+        TitleSummary.objects.all().delete()
+        titles = get_titles(Title.objects.order_by('id'))
+        last_id = 0
+        while True:
+            batch = list(titles.filter(id__gt=last_id)[:BATCH_SIZE])
+            if not batch:
+                break
+            create_summaries(batch)
+            last_id = batch[-1].id
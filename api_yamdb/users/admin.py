@@ -1,5 +1,13 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 admin.site.register(User)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'status', 'attempts',
+                    'next_attempt')
+    list_filter = ('status',)
+    search_fields = ('recipient',)
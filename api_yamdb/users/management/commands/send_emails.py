@@ -0,0 +1,147 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management import BaseCommand
+from django.db import connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued confirmation emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait when the queue is empty',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit as soon as the queue is empty',
+        )
+
+    def bury_abandoned(self, now):
+        """Leases that expired on the last attempt are not retried, e.g. a
+        message that crashes the worker every time it is sent."""
+        OutgoingEmail.objects.filter(
+            status=OutgoingEmail.SENDING,
+            next_attempt__lte=now,
+            attempts__gte=settings.EMAIL_QUEUE_MAX_ATTEMPTS,
+        ).update(
+            status=OutgoingEmail.DEAD,
+            message='',
+            last_error='Lease expired',
+        )
+
+    def claim_batch(self, batch_size):
+        """Lease due emails to this worker, including abandoned leases.
+
+        Every claim counts as an attempt, so a lease that expires is not a
+        free retry.
+        """
+        now = timezone.now()
+        self.bury_abandoned(now)
+        due = (
+            Q(status=OutgoingEmail.PENDING) | Q(status=OutgoingEmail.SENDING)
+        ) & Q(next_attempt__lte=now)
+        ids = list(
+            OutgoingEmail.objects.filter(due)
+            .order_by('next_attempt')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        claim = uuid.uuid4()
+        OutgoingEmail.objects.filter(due, id__in=ids).update(
+            status=OutgoingEmail.SENDING,
+            claim=claim,
+            attempts=F('attempts') + 1,
+            next_attempt=now + timedelta(seconds=settings.EMAIL_QUEUE_LEASE),
+        )
+        return list(OutgoingEmail.objects.filter(claim=claim))
+
+    def fail(self, email, error):
+        email.last_error = str(error)
+        if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            email.status = OutgoingEmail.DEAD
+            # The confirmation code is a credential, keep no copy of it.
+            email.message = ''
+        else:
+            email.status = OutgoingEmail.PENDING
+            email.next_attempt = timezone.now() + timedelta(
+                seconds=settings.EMAIL_QUEUE_RETRY_DELAY
+                * 2 ** (email.attempts - 1)
+            )
+        email.save(update_fields=(
+            'message', 'last_error', 'status', 'next_attempt'
+        ))
+
+    def deliver(self, emails):
+        """Send a batch over one mail connection; returns the sent count."""
+        mail_connection = get_connection(fail_silently=False)
+        try:
+            mail_connection.open()
+        except Exception as error:
+            for email in emails:
+                self.fail(email, error)
+            return 0
+        sent = 0
+        try:
+            for email in emails:
+                message = EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=email.from_email,
+                    to=[email.recipient],
+                    connection=mail_connection,
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    self.fail(email, error)
+                    continue
+                email.status = OutgoingEmail.SENT
+                email.message = ''
+                email.save(update_fields=('status', 'message'))
+                sent += 1
+        finally:
+            mail_connection.close()
+        return sent
+
+    def send_batch(self, emails):
+        try:
+            return self.deliver(emails)
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        batch_size = options['batch_size']
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                batches = []
+                for _ in range(workers):
+                    batch = self.claim_batch(batch_size)
+                    if not batch:
+                        break
+                    batches.append(batch)
+                if not batches:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+                    continue
+                sent = sum(executor.map(self.send_batch, batches))
+                claimed = sum(len(batch) for batch in batches)
+                self.stdout.write(f'Sent {sent} of {claimed} email(s)')
+        self.stdout.write(self.style.SUCCESS('The email queue is empty'))
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from api.validators import validate_username
 from api_yamdb.settings import ROLES, ROLES_MAX_LEN, DEFAUL_ROLE
@@ -47,3 +48,55 @@ class User(AbstractUser):
         ordering = ('id',)
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    DEAD = 'dead'
+    STATUSES = [
+        (PENDING, 'Ожидает отправки'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (DEAD, 'Не доставлено'),
+    ]
+
+    recipient = models.EmailField(
+        max_length=EMAIL_MAX_LEN,
+        verbose_name='Получатель'
+    )
+    from_email = models.EmailField(
+        max_length=EMAIL_MAX_LEN,
+        verbose_name='Отправитель'
+    )
+    subject = models.CharField(max_length=255, verbose_name='Тема')
+    message = models.TextField(verbose_name='Текст')
+    status = models.CharField(
+        choices=STATUSES,
+        max_length=len(SENDING),
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки'
+    )
+    next_attempt = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Следующая попытка'
+    )
+    claim = models.UUIDField(null=True, blank=True, editable=False)
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(fields=['status', 'next_attempt'],
+                         name='outgoing_email_due'),)
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -14,6 +14,11 @@ class Test00UserRegistration:
     url_token = '/api/v1/auth/token/'
     url_admin_create_user = '/api/v1/users/'
 
+    @pytest.fixture(autouse=True)
+    def send_in_request(self, settings):
+        # The tests read the email from the outbox right after signup.
+        settings.EMAIL_QUEUE_ENABLED = False
+
     def test_00_nodata_signup(self, client):
         response = client.post(self.url_signup)
 
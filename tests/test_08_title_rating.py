@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user, user_client):
+        author_map = {admin: admin_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        response = create_single_review(user_client, title_id, 'Ок', 8)
+        user_review_id = response.json()['id']
+        assert self.get_rating(admin_client, title_id) == 6
+
+        response = user_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{user_review_id}/',
+            data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        response = admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 10, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+        response = user_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{user_review_id}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) is None
+
+    def test_02_rebuild_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        call_command('rebuild_ratings', '--check')
+
+        Title.objects.filter(id=titles[0]['id']).update(
+            rating_sum=0, rating_count=0
+        )
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+
+        call_command('rebuild_ratings')
+        call_command('rebuild_ratings', '--check')
+        assert self.get_rating(admin_client, titles[0]['id']) == 5
+
+    def test_03_rating_follows_cascades_and_orm(self, admin_client, admin,
+                                                user, user_client):
+        from reviews.models import Review
+
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        assert self.get_rating(admin_client, title_id) == 7
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается, когда '
+            'отзывы удаляются вместе с автором.'
+        )
+        listed = admin_client.get('/api/v1/titles/').json()['results']
+        assert [
+            title['rating'] for title in listed if title['id'] == title_id
+        ] == [5]
+
+        review = Review.objects.get(id=reviews[0]['id'])
+        review.score = 2
+        review.save()
+        assert self.get_rating(admin_client, title_id) == 2, (
+            'Проверьте, что рейтинг следует и за изменениями через ORM.'
+        )
+        Review(id=review.id, title_id=title_id, author=admin, text='Да',
+               score=4, pub_date=review.pub_date).save()
+        assert self.get_rating(admin_client, title_id) == 4
+        call_command('rebuild_ratings', '--check')
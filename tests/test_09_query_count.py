@@ -0,0 +1,156 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from rest_framework.pagination import PageNumberPagination
+
+from api.authentication import USER_KEY
+from api.cache import get_cache
+from reviews.models import Category, Comment, Genre, Review, Title
+from tests.utils import get_json
+
+
+def create_catalogue(titles_count):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Ужасы', slug='horror'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(titles_count)
+    )
+    titles = Title.objects.all()
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title.id, genre_id=genre.id)
+        for title in titles
+        for genre in genres
+    )
+    call_command('rebuild_summaries')
+    return titles
+
+
+def create_review(author, titles_count=1):
+    title = create_catalogue(titles_count)[0]
+    review = Review.objects.create(
+        title=title, author=author, text='Отзыв', score=5
+    )
+    Comment.objects.create(review=review, author=author, text='Комментарий')
+    return title, review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    @pytest.mark.parametrize('page_size', (1, 10, 100))
+    def test_01_title_list(self, client, monkeypatch,
+                           django_assert_num_queries, page_size):
+        create_catalogue(page_size)
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        # fingerprint with the count, summaries of the page
+        with django_assert_num_queries(2):
+            results = get_json(client.get('/api/v1/titles/'))['results']
+        assert len(results) == page_size
+        assert all(len(title['genre']) == 2 for title in results), (
+            'Проверьте, что при GET-запросе к `/api/v1/titles/` '
+            'возвращаются жанры каждого произведения.'
+        )
+
+    def test_02_title_detail(self, client, django_assert_num_queries):
+        titles = create_catalogue(1)
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{titles[0].id}/')
+        assert response.json()['category']['slug'] == 'films'
+
+    def test_03_authenticated_user_is_cached(self, user, user_client,
+                                             admin_client,
+                                             django_assert_num_queries):
+        user_client.get('/api/v1/users/me/')
+        with django_assert_num_queries(0):
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        cached = get_cache().get(USER_KEY.format(user.id))
+        assert 'password' not in cached, (
+            'Проверьте, что хэш пароля не попадает в общий кэш.'
+        )
+        response = user_client.patch('/api/v1/users/me/', data={'bio': 'Я'})
+        assert response.json()['bio'] == 'Я'
+        user.refresh_from_db()
+        assert user.check_password('1234567'), (
+            'Проверьте, что изменение профиля пользователя из кэша не '
+            'затирает его пароль.'
+        )
+
+        response = user_client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        response = user_client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение роли пользователя сбрасывает '
+            'закэшированные данные аутентификации.'
+        )
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    @pytest.mark.parametrize('method,url,data,queries', (
+        # title, fingerprint with the count, reviews with authors
+        ('get', 'reviews/', None, 3),
+        ('get', 'reviews/{review}/', None, 1),
+        # title, begin, insert, rating update, summary select and update
+        ('post', 'reviews/', {'text': 'Ещё отзыв', 'score': 7}, 6),
+        # review, begin, update, rating update, summary select and update
+        ('patch', 'reviews/{review}/', {'score': 9}, 6),
+        # review, begin, rating update, comments, delete comments and review,
+        # summary select and update
+        ('delete', 'reviews/{review}/', None, 8),
+        # review, fingerprint with the count, comments with authors
+        ('get', 'reviews/{review}/comments/', None, 3),
+        ('get', 'reviews/{review}/comments/{comment}/', None, 1),
+        # review, insert
+        ('post', 'reviews/{review}/comments/', {'text': 'Ещё'}, 2),
+        # comment, update
+        ('patch', 'reviews/{review}/comments/{comment}/', {'text': 'Да'}, 2),
+        # comment, begin, delete
+        ('delete', 'reviews/{review}/comments/{comment}/', None, 3),
+    ))
+    def test_04_review_and_comment_budget(self, admin, admin_client,
+                                          moderator, django_assert_num_queries,
+                                          method, url, data, queries):
+        title, review = create_review(moderator)
+        comment = review.comments.get()
+        url = f'/api/v1/titles/{title.id}/' + url.format(
+            review=review.id, comment=comment.id
+        )
+        admin_client.get('/api/v1/users/me/')
+        with django_assert_num_queries(queries):
+            response = getattr(admin_client, method)(url, data=data)
+        assert response.status_code < 300, response.content
+
+    def test_05_duplicate_review(self, user, user_client):
+        title, _ = create_review(user)
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Ещё отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        title.refresh_from_db()
+        assert title.rating_count == 1, (
+            'Проверьте, что отклонённый повторный отзыв не меняет рейтинг '
+            'произведения.'
+        )
+
+    def test_06_cached_user_is_not_written_back(self, admin, admin_client):
+        admin_client.get('/api/v1/users/me/')
+        # Demoted without a signal, e.g. by another process.
+        type(admin).objects.filter(pk=admin.pk).update(role='user')
+        response = admin_client.patch('/api/v1/users/me/', data={'bio': 'Я'})
+        assert response.status_code == HTTPStatus.OK
+        admin.refresh_from_db()
+        assert admin.role == 'user' and admin.bio == 'Я', (
+            'Проверьте, что PATCH `/api/v1/users/me/` не записывает в базу '
+            'роль из закэшированного пользователя.'
+        )
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+
+from api import cache
+from tests.utils import create_genre, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ResponseCache:
+
+    def test_01_anonymous_list_is_cached(self, client, admin_client,
+                                         django_assert_num_queries):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            cached_response = client.get('/api/v1/titles/?page=1')
+        assert cached_response.json() == response.json()
+
+    def test_02_writes_invalidate_cache(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        assert client.get('/api/v1/genres/').json()['count'] == len(genres)
+        client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        assert client.get('/api/v1/genres/').json()['count'] == (
+            len(genres) - 1
+        ), 'Проверьте, что удаление жанра сбрасывает кэш списка жанров.'
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert genres[0] not in title['genre'], (
+            'Проверьте, что удаление жанра сбрасывает кэш произведений.'
+        )
+
+    def test_03_cache_stats(self, client, admin_client, user_client):
+        create_genre(admin_client)
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        assert user_client.get('/api/v1/cache/stats/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.get('/api/v1/cache/stats/')
+        assert response.status_code == HTTPStatus.OK
+        stats = response.json()['genres']
+        assert stats['hits'] >= 1 and stats['misses'] >= 1
+
+    def test_04_local_cache_expires_early(self, settings, monkeypatch,
+                                          client, admin_client,
+                                          django_assert_num_queries,
+                                          django_assert_max_num_queries):
+        create_titles(admin_client)
+        settings.API_CACHE_LOCAL_TIMEOUT = 0
+        client.get('/api/v1/genres/')
+        with django_assert_max_num_queries(2) as context:
+            client.get('/api/v1/genres/')
+        assert len(context), (
+            'Проверьте, что ответы в кэше отдельного процесса живут не '
+            'дольше `API_CACHE_LOCAL_TIMEOUT`.'
+        )
+        monkeypatch.setattr(cache, 'is_shared', lambda: True)
+        client.get('/api/v1/genres/')
+        with django_assert_num_queries(0):
+            client.get('/api/v1/genres/')
@@ -0,0 +1,97 @@
+import json
+from base64 import b64encode
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import pytest
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11CursorPagination:
+
+    def create_reviews(self, django_user_model):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        return title, [
+            Review.objects.create(
+                title=title,
+                author=django_user_model.objects.create_user(
+                    username=f'reviewer{idx}',
+                    email=f'reviewer{idx}@yamdb.fake',
+                ),
+                text=f'review number {idx}',
+                score=5,
+            )
+            for idx in range(10)
+        ]
+
+    def test_01_reviews_cursor_pages(self, client, django_user_model):
+        title, reviews = self.create_reviews(django_user_model)
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor='
+        seen = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме курсорной пагинации не выполняется '
+                'подсчёт общего количества отзывов.'
+            )
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert seen == [review.id for review in reversed(reviews)], (
+            'Проверьте, что курсорная пагинация отдаёт все отзывы от новых '
+            'к старым без пропусков и повторов.'
+        )
+
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json()['count'] == len(reviews)
+
+    def test_02_equal_timestamps(self, client, django_user_model):
+        title, reviews = self.create_reviews(django_user_model)
+        Review.objects.update(pub_date=reviews[0].pub_date)
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor=&page_size=3'
+        seen = []
+        while url:
+            data = client.get(url).json()
+            seen.extend(review['id'] for review in data['results'])
+            previous, url = data['previous'], data['next']
+        assert seen == [review.id for review in reversed(reviews)], (
+            'Проверьте, что отзывы с одинаковой датой публикации не '
+            'пропускаются и не повторяются.'
+        )
+
+        seen = []
+        while previous:
+            data = client.get(previous).json()
+            seen[:0] = [review['id'] for review in data['results']]
+            previous = data['previous']
+        assert seen == [review.id for review in reversed(reviews[1:])]
+
+        cursor = b64encode(urlencode({
+            'p': json.dumps(['nope', '1'])
+        }).encode()).decode()
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/', {'cursor': cursor}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_cursor_page_is_not_counted(self, client, django_user_model,
+                                           django_assert_num_queries):
+        title, _ = self.create_reviews(django_user_model)
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor='
+        # title, page of reviews with authors
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        etag = response['ETag']
+        cached = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что страница курсорной пагинации отвечает 304 на '
+            'совпадающий `If-None-Match`.'
+        )
+        last = response.json()['results'][-1]
+        Review.objects.filter(id=last['id']).delete()
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK
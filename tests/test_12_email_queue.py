@@ -0,0 +1,85 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+
+from users.management.commands.send_emails import Command
+from users.models import OutgoingEmail
+
+
+def signup(client):
+    data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+    response = client.post('/api/v1/auth/signup/', data=data)
+    assert response.status_code == HTTPStatus.OK
+    return data
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12EmailQueue:
+
+    @pytest.fixture(autouse=True)
+    def enable_queue(self, settings):
+        settings.EMAIL_QUEUE_ENABLED = True
+
+    def test_01_signup_queues_email(self, client):
+        outbox_before_count = len(mail.outbox)
+        data = signup(client)
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что при включённой очереди письмо с кодом '
+            'подтверждения не отправляется во время запроса.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == data['email']
+
+        call_command('send_emails', '--once', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert mail.outbox[-1].to == [data['email']]
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT
+        assert email.message == '', (
+            'Проверьте, что текст с кодом подтверждения не хранится после '
+            'отправки письма.'
+        )
+
+    def test_02_failed_email_is_retried_then_dead(self, client, settings,
+                                                  monkeypatch):
+        def broken_send(self, fail_silently=False):
+            raise ConnectionError('smtp is down')
+
+        monkeypatch.setattr(EmailMessage, 'send', broken_send)
+        settings.EMAIL_QUEUE_MAX_ATTEMPTS = 2
+        signup(client)
+
+        call_command('send_emails', '--once', stdout=StringIO())
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.attempts == 1
+        assert 'smtp is down' in email.last_error
+
+        OutgoingEmail.objects.update(next_attempt=email.created)
+        call_command('send_emails', '--once', stdout=StringIO())
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.DEAD, (
+            'Проверьте, что письмо попадает в статус `dead` после '
+            'исчерпания попыток отправки.'
+        )
+
+    def test_03_abandoned_lease_counts_as_attempt(self, client, settings):
+        settings.EMAIL_QUEUE_MAX_ATTEMPTS = 2
+        signup(client)
+        for attempt in (1, 2):
+            # The worker crashes after claiming the email.
+            [email] = Command().claim_batch(10)
+            assert email.attempts == attempt
+            OutgoingEmail.objects.update(next_attempt=email.created)
+
+        call_command('send_emails', '--once', stdout=StringIO())
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.DEAD, (
+            'Проверьте, что письмо с истёкшей арендой тоже расходует '
+            'попытки отправки.'
+        )
+        assert email.message == ''
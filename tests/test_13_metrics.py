@@ -0,0 +1,33 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Metrics:
+
+    def test_01_server_timing_header(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'view;dur=', 'render;dur=', 'total;dur='):
+            assert metric in timing, (
+                'Проверьте, что ответ содержит заголовок `Server-Timing` '
+                f'с метрикой `{metric}`.'
+            )
+
+    def test_02_metrics_endpoint(self, client, admin_client, user_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        assert user_client.get('/api/v1/metrics/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == HTTPStatus.OK
+        stats = response.json()['TitleViewSet.list']
+        assert stats['count'] >= 1
+        assert stats['avg_queries'] > 0
+        assert 'TitleViewSet.create' in response.json()
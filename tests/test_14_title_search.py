@@ -0,0 +1,35 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleSearch:
+
+    def search(self, client, query):
+        response = client.get('/api/v1/titles/', {'search': query})
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.search(client, 'Терминатор') == ['Терминатор'], (
+            'Проверьте, что параметр `search` ищет произведения по названию.'
+        )
+        assert self.search(client, 'крепк') == ['Крепкий орешек'], (
+            'Проверьте, что параметр `search` находит слова по префиксу.'
+        )
+        assert self.search(client, 'back') == ['Терминатор'], (
+            'Проверьте, что параметр `search` ищет по описанию произведения.'
+        )
+        assert self.search(client, 'орешек терминатор') == []
+
+    def test_02_search_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'чуж') == ['Чужой']
+
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert self.search(client, 'чужой') == []
@@ -0,0 +1,83 @@
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
+
+from reviews.facets import add_counts, create_cells
+from reviews.models import TitleFacet
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleFacets:
+    url = '/api/v1/titles/facets/'
+
+    def test_01_facet_counts(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        response = client.get(self.url)
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/titles/facets/` доступен без токена.'
+        )
+        assert response.json() == {
+            'genre': {
+                genres[0]['slug']: 1,
+                genres[1]['slug']: 1,
+                genres[2]['slug']: 1,
+            },
+            'category': {categories[0]['slug']: 1, categories[1]['slug']: 1},
+            'year': {'1984': 1, '1988': 1},
+        }, 'Проверьте количество произведений по жанрам, категориям и годам.'
+
+        data = client.get(
+            self.url, {'category': categories[0]['slug']}
+        ).json()
+        assert data['genre'] == {genres[0]['slug']: 1, genres[1]['slug']: 1}
+        assert data['year'] == {'1984': 1}
+        assert data['category'] == {
+            categories[0]['slug']: 1, categories[1]['slug']: 1
+        }, 'Фильтр по категории не должен сужать счётчики категорий.'
+
+    def test_02_facets_follow_changes(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={
+            'genre': [genres[2]['slug']],
+            'year': 1988,
+        })
+        admin_client.delete(f'/api/v1/categories/{categories[1]["slug"]}/')
+        data = client.get(self.url).json()
+        assert data == {
+            'genre': {genres[2]['slug']: 2},
+            'category': {categories[0]['slug']: 1},
+            'year': {'1988': 2},
+        }, 'Проверьте, что счётчики фасетов обновляются при изменениях.'
+
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        call_command('rebuild_facets')
+        assert client.get(self.url).json() == {
+            'genre': {genres[2]['slug']: 1},
+            'category': {categories[0]['slug']: 1},
+            'year': {'1988': 1},
+        }
+
+    def test_03_facets_with_search(self, client, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        data = client.get(self.url, {'search': 'терминатор'}).json()
+        assert data['category'] == {categories[0]['slug']: 1}
+        assert data['year'] == {'1984': 1}
+
+    @pytest.mark.parametrize('cell', (
+        (1, 2, 2000), (None, 2, 2000), (1, None, 2000), (None, None, 2000)
+    ))
+    def test_04_one_row_per_cell(self, cell):
+        add_counts([cell], 1)
+        # A writer that lost the race finds the cell already created.
+        create_cells([cell])
+        add_counts([cell], 1)
+        genre_id, category_id, year = cell
+        rows = TitleFacet.objects.filter(
+            genre_id=genre_id, category_id=category_id, year=year
+        )
+        assert list(rows.values_list('count', flat=True)) == [2]
+        with pytest.raises(IntegrityError):
+            TitleFacet.objects.create(
+                genre_id=genre_id, category_id=category_id, year=year
+            )
@@ -0,0 +1,135 @@
+import pytest
+from django.utils.http import http_date
+
+from reviews.models import Category, Genre
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ConditionalGet:
+
+    def assert_not_modified(self, client, url, response):
+        etag = response['ETag']
+        cached = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == 304, (
+            f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not cached.content
+        assert cached['ETag'] == etag
+        if 'Last-Modified' not in response:
+            return
+        cached = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert cached.status_code == 304, (
+            f'Проверьте, что GET-запрос к `{url}` с `If-Modified-Since` '
+            'не раньше `Last-Modified` возвращает ответ со статусом 304.'
+        )
+
+    def test_01_titles(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/'):
+            response = client.get(url)
+            assert response.status_code == 200
+            assert 'ETag' in response, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок `ETag`.'
+            )
+            self.assert_not_modified(client, url, response)
+        assert 'Last-Modified' in response
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Новый отзыв меняет рейтинг произведения, проверьте, что '
+            'после него `ETag` произведения изменился.'
+        )
+        assert response.json()['rating'] == 7
+
+        etag = client.get('/api/v1/titles/')['ETag']
+        assert client.get(
+            '/api/v1/titles/?year=1984', HTTP_IF_NONE_MATCH=etag
+        ).status_code == 200, 'ETag должен зависеть от фильтров запроса.'
+
+    def test_02_reviews_and_comments(self, client, admin_client,
+                                     user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 5
+        ).json()
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{review["id"]}/comments/'
+        create_single_comment(
+            user_client, titles[0]['id'], review['id'], 'Комментарий'
+        )
+        for url in (reviews_url, f'{reviews_url}{review["id"]}/',
+                    comments_url):
+            self.assert_not_modified(client, url, client.get(url))
+
+        etag = client.get(comments_url)['ETag']
+        create_single_comment(
+            user_client, titles[0]['id'], review['id'], 'Ещё комментарий'
+        )
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['count'] == 2
+
+        etag = client.get(reviews_url)['ETag']
+        user_client.patch(
+            f'{reviews_url}{review["id"]}/', data={'text': 'Новый текст'}
+        )
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == 200, (
+            'Проверьте, что изменение отзыва меняет `ETag` списка отзывов.'
+        )
+
+    def test_03_missing_object(self, client):
+        response = client.get('/api/v1/titles/999/', HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == 404
+
+    def test_04_deleted_rows(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        first = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 5
+        ).json()
+        create_single_review(admin_client, titles[0]['id'], 'Ещё', 7)
+        for url, deleted in (
+            (reviews_url, f'{reviews_url}{first["id"]}/'),
+            ('/api/v1/titles/', f'/api/v1/titles/{titles[1]["id"]}/'),
+        ):
+            response = client.get(url)
+            assert 'Last-Modified' not in response
+            admin_client.delete(deleted)
+            assert client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            ).status_code == 200, (
+                f'Проверьте, что удаление записи меняет `ETag` `{url}`.'
+            )
+            assert client.get(
+                url, HTTP_IF_MODIFIED_SINCE=http_date()
+            ).status_code == 200, (
+                'Проверьте, что `If-Modified-Since` не даёт 304 для списка, '
+                'из которого удалили запись.'
+            )
+
+    def test_05_renamed_genre_and_category(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        urls = ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/')
+        for model, slug in ((Genre, genres[0]['slug']),
+                            (Category, categories[0]['slug'])):
+            etags = {url: client.get(url)['ETag'] for url in urls}
+            instance = model.objects.get(slug=slug)
+            instance.name = f'{instance.name} (новое)'
+            instance.save()
+            for url, etag in etags.items():
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                assert response.status_code == 200, (
+                    f'Проверьте, что переименование `{model.__name__}` '
+                    f'меняет `ETag` ответа на GET-запрос к `{url}`.'
+                )
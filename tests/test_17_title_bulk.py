@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleBulk:
+    url = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_create(self, client, admin_client, user_client,
+                            django_assert_max_num_queries):
+        _, categories, genres = create_titles(admin_client)
+        data = [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genres[0]['slug'], genres[idx % 2 + 1]['slug']],
+                'category': categories[idx % 2]['slug'],
+            }
+            for idx in range(20)
+        ]
+        response = user_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что массовое создание произведений доступно '
+            'только администратору.'
+        )
+        # Slug and id lookups do not depend on the number of titles.
+        with django_assert_max_num_queries(16):
+            response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Если POST-запрос администратора к `/api/v1/titles/bulk/` '
+            'содержит корректные данные - должен вернуться ответ со '
+            'статусом 201.'
+        )
+        ids = [item['id'] for item in response.json()]
+        assert len(set(ids)) == 20
+        title = client.get(f'/api/v1/titles/{ids[3]}/').json()
+        assert title['name'] == 'Произведение 3'
+        assert title['category']['slug'] == categories[1]['slug']
+        assert {genre['slug'] for genre in title['genre']} == {
+            genres[0]['slug'], genres[2]['slug']
+        }
+        facets = client.get('/api/v1/titles/facets/').json()
+        assert facets['genre'][genres[0]['slug']] == 21, (
+            'Проверьте, что массовое создание обновляет счётчики фасетов.'
+        )
+
+    def test_02_bulk_update_and_errors(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = [
+            {'id': titles[0]['id'], 'year': 1991,
+             'genre': [genres[2]['slug']]},
+            {'name': 'Без жанра', 'year': 2001, 'genre': ['unknown'],
+             'category': categories[0]['slug']},
+            {'id': 999, 'name': 'Нет такого'},
+            {'name': 'Чужой', 'year': 1979, 'genre': [genres[1]['slug']],
+             'category': categories[1]['slug']},
+        ]
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            'Если часть произведений не прошла проверку, должен вернуться '
+            'ответ со статусом 207.'
+        )
+        results = response.json()
+        assert results[0] == {'id': titles[0]['id']}
+        assert 'genre' in results[1]['errors']
+        assert 'id' in results[2]['errors']
+        assert 'id' in results[3]
+
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title['year'] == 1991
+        assert title['name'] == titles[0]['name']
+        assert [genre['slug'] for genre in title['genre']] == [
+            genres[2]['slug']
+        ]
+        assert client.get('/api/v1/titles/').json()['count'] == 3
+        assert client.get('/api/v1/titles/facets/').json()['genre'] == {
+            genres[1]['slug']: 1, genres[2]['slug']: 2
+        }
+
+        response = admin_client.post(
+            self.url, data={'name': 'Не список'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_year_is_required(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        data = [
+            {'name': 'Без года', 'genre': [genres[0]['slug']],
+             'category': categories[0]['slug']},
+            {'name': 'С годом', 'year': 2001, 'genre': [genres[0]['slug']],
+             'category': categories[0]['slug']},
+        ]
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            'Проверьте, что произведение без года отклоняется, а не '
+            'приводит к ошибке сервера.'
+        )
+        results = response.json()
+        assert 'year' in results[0]['errors']
+        title = client.get(f'/api/v1/titles/{results[1]["id"]}/').json()
+        assert title['name'] == 'С годом'
@@ -0,0 +1,80 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from django.core.signals import request_started
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Database:
+
+    def test_01_sqlite_pragmas(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Только для SQLite')
+        connection.close()
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+        assert synchronous == 1, (
+            'Проверьте, что новые соединения с SQLite получают '
+            '`synchronous = NORMAL`.'
+        )
+
+    def test_02_unusable_connection_is_closed(self, monkeypatch):
+        connection.ensure_connection()
+        closed = []
+        monkeypatch.setitem(connection.settings_dict, 'HEALTH_CHECKS', True)
+        monkeypatch.setattr(connection, 'health_checked_at', None,
+                            raising=False)
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(1))
+        request_started.send(sender=None)
+        assert closed, (
+            'Проверьте, что в начале запроса закрываются постоянные '
+            'соединения, которые больше не работают.'
+        )
+
+    def test_03_checks_are_spaced_out(self, monkeypatch):
+        connection.ensure_connection()
+        checks = []
+        monkeypatch.setitem(connection.settings_dict, 'HEALTH_CHECKS', True)
+        monkeypatch.setattr(connection, 'health_checked_at', None,
+                            raising=False)
+        monkeypatch.setattr(
+            connection, 'is_usable', lambda: checks.append(1) or True
+        )
+        for _ in range(3):
+            request_started.send(sender=None)
+        assert len(checks) == 1, (
+            'Проверьте, что соединение проверяется не на каждом запросе, '
+            'а не чаще раза в `HEALTH_CHECK_INTERVAL` секунд.'
+        )
+
+    def test_04_exhausted_pool_waits(self, monkeypatch):
+        pytest.importorskip('psycopg2')
+        from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+        from api.backends.postgresql_pool import base
+
+        monkeypatch.setattr(
+            base.pool.psycopg2, 'connect',
+            lambda *args, **kwargs: SimpleNamespace(
+                closed=False,
+                info=SimpleNamespace(
+                    transaction_status=TRANSACTION_STATUS_IDLE
+                ),
+                close=lambda: None,
+            ),
+        )
+        pool = base.BlockingConnectionPool(1, 1, 5)
+        taken = pool.getconn()
+        threading.Timer(0.1, pool.putconn, (taken,)).start()
+        assert pool.getconn() is taken, (
+            'Проверьте, что при исчерпании пула запрос ждёт свободное '
+            'соединение.'
+        )
+        pool.timeout = 0.1
+        with pytest.raises(base.pool.PoolError):
+            pool.getconn()
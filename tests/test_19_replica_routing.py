@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import WRITTEN_KEY, get_cache
+from tests.utils import create_single_review, create_titles, get_json
+
+
+@pytest.fixture
+def replica(settings):
+    """A second connection to the test database standing in for a replica."""
+    connections.databases['replica1'] = {**connection.settings_dict}
+    settings.DATABASE_REPLICAS = ['replica1']
+    yield connections['replica1']
+    connections['replica1'].close()
+    del connections['replica1']
+    del connections.databases['replica1']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ReplicaRouting:
+
+    def test_01_reads_go_to_replica(self, client, admin_client, replica):
+        create_titles(admin_client)
+        # The replica has caught up with the writes.
+        get_cache().delete(WRITTEN_KEY.format('titles'))
+        with CaptureQueriesContext(replica) as replica_queries:
+            with CaptureQueriesContext(connection) as primary_queries:
+                response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 2
+        assert len(replica_queries) and not len(primary_queries), (
+            'Проверьте, что GET-запросы читают данные из реплики.'
+        )
+
+    def test_02_read_your_writes(self, client, admin_client, user_client,
+                                 replica):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 5)
+        with CaptureQueriesContext(replica) as replica_queries:
+            response = user_client.get(url)
+        assert response.json()['count'] == 1
+        assert not len(replica_queries), (
+            'Проверьте, что после записи пользователь какое-то время '
+            'читает данные из основной базы.'
+        )
+        get_cache().delete(WRITTEN_KEY.format('reviews'))
+        with CaptureQueriesContext(replica) as replica_queries:
+            client.get(url)
+        assert len(replica_queries), (
+            'Другие клиенты должны продолжать читать из реплики.'
+        )
+
+    def test_03_cache_is_filled_from_primary(self, client, admin_client,
+                                             replica):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        with CaptureQueriesContext(replica) as replica_queries:
+            response = client.get(url)
+        assert response.json()['name'] == titles[0]['name']
+        assert not len(replica_queries), (
+            'Проверьте, что сразу после записи кэш ответов заполняется '
+            'данными из основной базы, а не из отстающей реплики.'
+        )
+
+        get_cache().delete(WRITTEN_KEY.format('titles'))
+        with CaptureQueriesContext(replica) as replica_queries:
+            client.get(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert len(replica_queries)
+
+    def test_04_streamed_rows_read_replica(self, client, admin_client,
+                                           replica):
+        create_titles(admin_client)
+        get_cache().delete(WRITTEN_KEY.format('titles'))
+        response = client.get('/api/v1/titles/', {'page_size': 100})
+        assert response.streaming
+        with CaptureQueriesContext(replica) as replica_queries:
+            with CaptureQueriesContext(connection) as primary_queries:
+                data = get_json(response)
+        assert len(data['results']) == 2
+        assert len(replica_queries) and not len(primary_queries), (
+            'Проверьте, что строки потоковой страницы читаются из реплики.'
+        )
@@ -0,0 +1,44 @@
+import pytest
+from asgiref.sync import async_to_sync
+
+from api.views import TitleViewSet
+from tests.utils import create_titles
+
+
+@async_to_sync
+async def serve(path, query_string, headers):
+    """Run a GET through the project's ASGI application."""
+    from api_yamdb.asgi import application
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await application({
+        'type': 'http', 'method': 'GET', 'path': path,
+        'query_string': query_string.encode(), 'headers': headers,
+    }, receive, send)
+    return messages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Asgi:
+
+    def test_01_streamed_by_chunks(self, settings, monkeypatch, client,
+                                   admin_client):
+        create_titles(admin_client)
+        settings.API_STREAMING_PAGE_SIZE = 1
+        monkeypatch.setattr(TitleViewSet, 'streaming_chunk_size', 1)
+        expected = b''.join(client.get('/api/v1/titles/').streaming_content)
+        messages = serve('/api/v1/titles/', '', [])
+        assert messages[0]['status'] == 200
+        bodies = [message['body'] for message in messages[1:-1]]
+        assert len(bodies) > 3 and b''.join(bodies) == expected, (
+            'Проверьте, что под ASGI потоковый ответ отдаётся порциями, '
+            'а не собирается в памяти целиком.'
+        )
+        assert messages[-1] == {'type': 'http.response.body'}
@@ -0,0 +1,94 @@
+import pytest
+from django.core.management import call_command
+
+from reviews import signals
+from reviews.models import Title, TitleSummary
+from tests.utils import create_single_review, create_titles
+
+
+def assert_summaries_match(client):
+    for title_id in Title.objects.values_list('id', flat=True):
+        detail = client.get(f'/api/v1/titles/{title_id}/').json()
+        assert TitleSummary.objects.get(title_id=title_id).data == detail, (
+            'Проверьте, что `TitleSummary` совпадает с ответом '
+            '`TitleReadSerializer`.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleSummary:
+    url = '/api/v1/titles/'
+
+    def test_01_summaries_follow_changes(self, admin_client, user_client,
+                                         moderator_client):
+        titles, categories, genres = create_titles(admin_client)
+        assert_summaries_match(admin_client)
+
+        admin_client.patch(f'{self.url}{titles[0]["id"]}/', data={
+            'genre': [genres[2]['slug']],
+            'name': 'Терминатор 2',
+        })
+        assert_summaries_match(admin_client)
+
+        for author_client, score in ((user_client, 4),
+                                     (moderator_client, 7)):
+            create_single_review(author_client, titles[0]['id'], 'Отзыв',
+                                 score)
+        assert_summaries_match(admin_client)
+        assert TitleSummary.objects.filter(data__rating=5).exists(), (
+            'Проверьте, что `TitleSummary` обновляется после отзывов.'
+        )
+
+        admin_client.delete(f'/api/v1/categories/{categories[1]["slug"]}/')
+        admin_client.delete(f'/api/v1/genres/{genres[2]["slug"]}/')
+        assert_summaries_match(admin_client)
+
+        admin_client.delete(f'{self.url}{titles[1]["id"]}/')
+        assert not TitleSummary.objects.filter(
+            title_id=titles[1]['id']
+        ).exists()
+
+    def test_02_list_is_served_from_summaries(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        TitleSummary.objects.filter(title_id=titles[0]['id']).update(
+            data={'id': titles[0]['id'], 'name': 'Из сводки'}
+        )
+        results = client.get(self.url).json()['results']
+        assert results[0] == {'id': titles[0]['id'], 'name': 'Из сводки'}, (
+            'Проверьте, что список произведений читается из `TitleSummary`.'
+        )
+
+        call_command('rebuild_summaries')
+        assert_summaries_match(admin_client)
+
+    def test_03_missing_summaries(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        expected = client.get(self.url, {'year': 1984}).json()['results']
+        TitleSummary.objects.all().delete()
+        results = client.get(
+            self.url, {'year': 1984, 'page': 1}
+        ).json()['results']
+        assert results == expected, (
+            'Проверьте, что произведения без `TitleSummary` тоже '
+            'попадают в список.'
+        )
+        assert results[0]['id'] == titles[0]['id']
+
+    def test_04_text_edits_keep_summary(self, monkeypatch, admin_client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(user_client, titles[0]['id'],
+                                      'Отзыв', 4).json()
+        refreshed = []
+        monkeypatch.setattr(signals, 'refresh_ratings',
+                            refreshed.extend)
+        url = f'{self.url}{titles[0]["id"]}/reviews/{review["id"]}/'
+        user_client.patch(url, data={'text': 'Другой текст'})
+        assert not refreshed, (
+            'Проверьте, что правка текста отзыва не пересчитывает '
+            'рейтинг в `TitleSummary`.'
+        )
+        user_client.patch(url, data={'score': 9})
+        assert refreshed == [titles[0]['id']]
+        user_client.delete(url)
+        assert refreshed == [titles[0]['id']] * 2
@@ -0,0 +1,64 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.management.commands.benchmark import seed_dataset
+from reviews.models import Title
+
+# ``SCAN t`` reads every row of the table, ``SCAN t USING INDEX`` walks an
+# index in order and ``SEARCH`` looks rows up by key.
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?(?P<table>\w+)$')
+
+
+def get_plans(sql_queries):
+    plans = {}
+    with connection.cursor() as cursor:
+        for sql in sql_queries:
+            if not sql.startswith('SELECT'):
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plans[sql] = [row[-1] for row in cursor.fetchall()]
+    return plans
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite',
+                    reason='Query plans are checked on SQLite')
+@pytest.mark.django_db(transaction=True)
+class Test23QueryPlans:
+
+    def test_01_list_endpoints_use_indexes(self, admin_client):
+        seed_dataset(titles=300, reviews=3, comments=2)
+        title = Title.objects.order_by('id').first()
+        review = title.reviews.order_by('id').first()
+        genre = title.genre.first()
+        urls = (
+            '/api/v1/titles/',
+            '/api/v1/titles/?page=3',
+            f'/api/v1/titles/?genre={genre.slug}',
+            f'/api/v1/titles/?category={title.category.slug}',
+            f'/api/v1/titles/?category={title.category.slug}'
+            f'&year={title.year}',
+            f'/api/v1/titles/?year={title.year}',
+            f'/api/v1/titles/?name={title.name}',
+            '/api/v1/titles/facets/',
+            '/api/v1/genres/',
+            '/api/v1/categories/',
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/?cursor=',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            '?cursor=',
+        )
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.get(url)
+            assert response.status_code == 200, url
+            plans = get_plans(query['sql'] for query in context)
+            for sql, plan in plans.items():
+                scans = [step for step in plan if FULL_SCAN.match(step)]
+                assert not scans, (
+                    f'Проверьте индексы: запрос к `{url}` читает всю '
+                    f'таблицу ({", ".join(scans)}):\n{sql}'
+                )
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+
+from api import metrics
+from api.views import UserViewSet
+from tests.utils import create_reviews, create_titles, get_content
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24StreamingLists:
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/titles/',
+        '/api/v1/titles/?year=1984',
+        '/api/v1/users/',
+        '/api/v1/users/?search=user',
+        '/api/v1/titles/{title}/reviews/',
+    ))
+    def test_01_streamed_pages_match(self, settings, monkeypatch,
+                                     admin_client, user, user_client,
+                                     moderator, moderator_client, url):
+        _, titles = create_reviews(admin_client, {
+            user: user_client, moderator: moderator_client
+        })
+        url = url.format(title=titles[0]['id'])
+        monkeypatch.setattr(PageNumberPagination, 'page_size', 1)
+        settings.API_STREAMING_PAGE_SIZE = 1000
+        expected = admin_client.get(url)
+        assert not expected.streaming
+        settings.API_STREAMING_PAGE_SIZE = 1
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert response.streaming, (
+            f'Проверьте, что большие страницы `{url}` отдаются потоком.'
+        )
+        assert get_content(response) == expected.content, (
+            'Проверьте, что потоковый ответ совпадает с обычным.'
+        )
+
+    def test_02_streams_in_chunks(self, settings, monkeypatch, admin_client,
+                                  django_assert_num_queries):
+        create_titles(admin_client)
+        settings.API_STREAMING_PAGE_SIZE = 2
+        monkeypatch.setattr(UserViewSet, 'streaming_chunk_size', 1)
+        response = admin_client.get('/api/v1/users/')
+        # Rows are only read while the body is consumed, through one cursor.
+        with django_assert_num_queries(1):
+            data = json.loads(get_content(response))
+        assert data['count'] == len(data['results']) == 1
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/titles/?format=api',
+        '/api/v1/titles/{title}/reviews/?cursor=',
+    ))
+    def test_03_not_streamed(self, settings, admin_client, url):
+        titles, _, _ = create_titles(admin_client)
+        settings.API_STREAMING_PAGE_SIZE = 2
+        response = admin_client.get(url.format(title=titles[0]['id']))
+        assert response.status_code == 200
+        assert not response.streaming
+
+    def test_04_invalid_page(self, settings, admin_client):
+        settings.API_STREAMING_PAGE_SIZE = 2
+        response = admin_client.get('/api/v1/users/?page=5')
+        assert response.status_code == 404
+
+    def test_05_largest_pages_are_streamed(self, admin_client, user,
+                                           user_client):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = admin_client.get(url, {'page_size': 50})
+        assert response.streaming, (
+            'Проверьте, что страницы наибольшего размера, который '
+            'разрешает эндпоинт, отдаются потоком.'
+        )
+        assert json.loads(get_content(response))['count'] == 1
+        assert not admin_client.get(url, {'page_size': 49}).streaming
+
+    def test_06_streamed_rows_are_measured(self, settings, monkeypatch,
+                                           admin_client):
+        create_titles(admin_client)
+        settings.API_STREAMING_PAGE_SIZE = 2
+        monkeypatch.setattr(UserViewSet, 'streaming_chunk_size', 1)
+        recorded = []
+        monkeypatch.setattr(
+            metrics, 'record',
+            lambda tag, total, request_metrics: recorded.append(
+                (tag, request_metrics.queries)
+            ),
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get('/api/v1/users/')
+            assert not recorded
+            get_content(response)
+        assert recorded == [('UserViewSet.list', len(context))], (
+            'Проверьте, что запросы, выполненные при чтении потока, '
+            'попадают в метрики эндпоинта.'
+        )
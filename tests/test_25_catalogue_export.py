@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Review, Title
+from tests.utils import create_reviews
+from users.models import User
+
+TABLES = ('users', 'category', 'genre', 'titles', 'genre_title', 'review',
+          'comments')
+
+
+def export(client, **params):
+    response = client.get('/api/v1/titles/export/', params)
+    assert response.status_code == 200, (
+        'Проверьте, что администратор может выгрузить каталог.'
+    )
+    assert response.streaming, 'Проверьте, что выгрузка отдаётся потоком.'
+    return b''.join(response.streaming_content).decode()
+
+
+def read_csv(content):
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25CatalogueExport:
+
+    def test_01_only_staff(self, client, user_client, admin_client):
+        assert client.get('/api/v1/titles/export/').status_code == 401
+        assert user_client.get('/api/v1/titles/export/').status_code == 403
+        response = admin_client.get('/api/v1/titles/export/',
+                                    {'table': 'reviews_title'})
+        assert response.status_code == 400
+
+    def test_02_ndjson(self, admin_client, user, user_client):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        lines = export(admin_client).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            admin_client.get(f'/api/v1/titles/{title["id"]}/').json()
+            for title in titles
+        ], 'Проверьте, что произведения выгружаются с жанрами и рейтингом.'
+
+        reviews = [
+            json.loads(line)
+            for line in export(admin_client, table='review').splitlines()
+        ]
+        assert [review['title_id'] for review in reviews] == [
+            titles[0]['id']
+        ]
+
+        resumed = export(admin_client, after=titles[0]['id']).splitlines()
+        assert [json.loads(line)['id'] for line in resumed] == [
+            titles[1]['id']
+        ], 'Проверьте, что выгрузку можно продолжить после id.'
+
+    def test_03_csv_round_trip(self, tmp_path, admin_client, user,
+                               user_client):
+        create_reviews(admin_client, {user: user_client})
+        exported = {}
+        for table in TABLES:
+            exported[table] = export(admin_client, table=table, format='csv')
+            (tmp_path / f'{table}.csv').write_text(
+                exported[table], encoding='utf-8'
+            )
+        assert len(read_csv(exported['titles'])) == 2
+        assert len(read_csv(exported['genre_title'])) == 3
+        for model in (Title, Review, Category, Genre, User):
+            model.objects.all().delete()
+
+        call_command('import_csv', path=str(tmp_path), stdout=io.StringIO())
+        for table in TABLES:
+            assert read_csv(exported[table]) == read_csv(
+                export(admin_client, table=table, format='csv')
+            ), f'Проверьте, что `{table}` переносится через import_csv.'
+        assert Title.objects.filter(rating_count=1).exists()
@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.pagination import TitlePagination
+from tests.utils import create_reviews, create_titles, get_json
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26PageSize:
+
+    def test_01_page_size(self, client, admin_client, monkeypatch):
+        titles, _, genres = create_titles(admin_client)
+        data = client.get('/api/v1/titles/', {'page_size': 1}).json()
+        assert data['count'] == 2
+        assert [title['id'] for title in data['results']] == [
+            titles[0]['id']
+        ], 'Проверьте, что `page_size` задаёт размер страницы.'
+        assert 'page_size=1' in data['next']
+
+        monkeypatch.setattr(TitlePagination, 'max_page_size', 1)
+        # A page of the largest size is streamed.
+        data = get_json(client.get('/api/v1/titles/', {'page_size': 50}))
+        assert len(data['results']) == 1, (
+            'Проверьте, что `page_size` ограничен максимумом эндпоинта.'
+        )
+        data = client.get('/api/v1/genres/', {'page_size': 2}).json()
+        assert len(data['results']) == 2
+
+    def test_02_without_count(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/?page_size=1&count=false'
+        data = client.get(url).json()
+        assert 'count' not in data, (
+            'Проверьте, что при `count=false` общее количество не считается.'
+        )
+        assert data['previous'] is None
+        assert [title['id'] for title in data['results']] == [
+            titles[0]['id']
+        ]
+        data = client.get(data['next']).json()
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id']
+        ]
+        assert data['next'] is None
+        assert 'page=' not in data['previous']
+        assert client.get(f'{url}&page=3').status_code == 404
+        assert client.get(f'{url}&page=0').status_code == 404
+
+    def test_03_count_query_is_skipped(self, admin_client,
+                                       django_assert_num_queries):
+        admin_client.get('/api/v1/users/me/')
+        with django_assert_num_queries(2):
+            admin_client.get('/api/v1/users/')
+        with django_assert_num_queries(1):
+            response = admin_client.get('/api/v1/users/?count=false')
+        assert len(response.json()['results']) == 1
+
+    def test_04_uncounted_pages_skip_fingerprint(self, client, admin_client,
+                                                 user, user_client):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        for url in ('/api/v1/titles/',
+                    f'/api/v1/titles/{titles[0]["id"]}/reviews/'):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url, {'count': 'false'})
+            assert response.status_code == 200
+            assert not any(
+                'COUNT(' in query['sql'] for query in context.captured_queries
+            ), (
+                f'Проверьте, что `{url}?count=false` не выполняет '
+                '`COUNT(*)`, в том числе для ETag.'
+            )
+            not_modified = client.get(
+                url, {'count': 'false'}, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+            assert not_modified.status_code == 304
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.cache import get_cache
+from api.throttling import TokenBucketThrottle
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(TokenBucketThrottle, 'THROTTLE_RATES', {
+        'signup': '2/min', 'token': '2/min'
+    })
+    monkeypatch.setattr(TokenBucketThrottle, 'timer', lambda self: now[0])
+    return now
+
+
+def signup(client, idx, **extra):
+    return client.post(SIGNUP_URL, data={
+        'username': f'bot{idx}', 'email': f'bot{idx}@yamdb.fake'
+    }, **extra)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Throttling:
+
+    def test_01_signup_per_ip(self, client, clock, django_assert_num_queries):
+        assert signup(client, 1).status_code == HTTPStatus.OK
+        assert signup(client, 2).status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = signup(client, 3)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частые регистрации с одного адреса '
+            'отклоняются без запросов к базе.'
+        )
+        assert response['Retry-After'] == '30'
+
+        assert signup(
+            client, 3, REMOTE_ADDR='10.0.0.2'
+        ).status_code == HTTPStatus.OK
+        clock[0] += 30
+        assert signup(client, 4).status_code == HTTPStatus.OK, (
+            'Проверьте, что ведро пополняется со временем.'
+        )
+        assert signup(client, 5).status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+    def test_02_signup_per_identity(self, client, clock):
+        for idx in range(2):
+            response = signup(client, 1, REMOTE_ADDR=f'10.0.0.{idx}')
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(SIGNUP_URL, data={
+            'username': 'other', 'email': 'BOT1@yamdb.fake'
+        }, REMOTE_ADDR='10.0.0.9')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрации ограничиваются и по почте.'
+        )
+
+    def test_03_token_per_username(self, client, clock, user):
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for idx in range(2):
+            response = client.post(TOKEN_URL, data=data,
+                                   REMOTE_ADDR=f'10.0.0.{idx}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(TOKEN_URL, data=data, REMOTE_ADDR='10.0.0.9')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подбор кода для одного пользователя '
+            'ограничивается.'
+        )
+
+    def test_04_forwarded_for_is_not_trusted(self, client, clock):
+        for idx in range(2):
+            response = signup(client, idx,
+                              HTTP_X_FORWARDED_FOR=f'10.1.0.{idx}')
+            assert response.status_code == HTTPStatus.OK
+        response = signup(client, 2, HTTP_X_FORWARDED_FOR='10.1.0.9')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что адрес клиента не берётся из присланного им '
+            '`X-Forwarded-For`.'
+        )
+
+    def test_05_buckets_are_locked(self, client, clock, monkeypatch):
+        monkeypatch.setattr(TokenBucketThrottle, 'lock_wait', 0)
+        key = TokenBucketThrottle.cache_format % {
+            'scope': 'signup', 'ident': 'ip:127.0.0.1'
+        }
+        get_cache().add(TokenBucketThrottle.lock_format % key, 1)
+        assert signup(client, 1).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), (
+            'Проверьте, что ведро, которое обновляет другой запрос, '
+            'не расходуется параллельно.'
+        )
+        get_cache().delete(TokenBucketThrottle.lock_format % key)
+        assert signup(client, 1).status_code == HTTPStatus.OK
+        assert not get_cache().get(TokenBucketThrottle.lock_format % key), (
+            'Проверьте, что блокировка ведра снимается после запроса.'
+        )
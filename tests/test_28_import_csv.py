@@ -0,0 +1,28 @@
+import io
+from datetime import datetime, timezone
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ImportCSV:
+
+    def test_01_dates_are_kept(self):
+        started = datetime.now(timezone.utc)
+        call_command('import_csv', stdout=io.StringIO())
+        review = Review.objects.get(id=1)
+        assert review.pub_date == datetime(
+            2019, 9, 24, 21, 8, 21, 567000, tzinfo=timezone.utc
+        ), 'Проверьте, что import_csv сохраняет дату публикации отзыва.'
+        assert Comment.objects.get(id=1).pub_date.year == 2020
+
+        comment = Comment.objects.create(
+            review=review, author=review.author, text='После импорта'
+        )
+        assert comment.pub_date >= started, (
+            'Проверьте, что после импорта дата публикации снова '
+            'проставляется автоматически.'
+        )
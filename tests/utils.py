@@ -1,3 +1,4 @@
+import json
 from http import HTTPStatus
 
 
@@ -305,3 +306,14 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def get_content(response):
+    if response.streaming:
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+def get_json(response):
+    """``response.json()`` that also reads streamed pages."""
+    return json.loads(get_content(response))